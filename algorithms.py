@@ -1,288 +1,490 @@
 """
 CPU Scheduling Algorithms Implementation
-This file contains the 5 basic scheduling algorithms
+This file contains the 5 basic scheduling algorithms,
+plus preemptive versions of SJN and Priority, a multi-level feedback queue
+and two proportional-share algorithms (lottery and stride)
+burst_scheduling runs algorithms 1-7 on processes that also do I/O
 Each algorithm decides which process to run next
 """
 
-import parser
+import heapq
+import random
+from collections import deque
 
-# We'll use simple lists instead of complex data structures
-# This makes it easier for beginners to understand
+import instrument
+from engine import ArrivalStream, alone_run_time, run_bursts, run_non_preemptive, run_preemptive
+from models import ScheduleResult
+from ready_queue import MultiLevelReadyQueue, TicketTree
 
+# Multi-level feedback queue defaults: how many levels, and how often
+# (in bottom-level quanta) every process is boosted back to the top level
+MLFQ_LEVELS = 3
+MLFQ_BOOST_QUANTA = 10
 
-def first_come_first_serve():
+# With I/O bursts, algorithms 1-7 look at the current CPU burst instead of the
+# whole service time: (key_of(process, burst_time), preemptive) for each of them
+# FCFS uses one key for everybody, so the ready queue keeps the order processes became ready
+BURST_KEYS = {
+    "1": (lambda process, burst_time: 0, False),
+    "2": (lambda process, burst_time: burst_time, False),
+    "3": (lambda process, burst_time: process.priority, False),
+    "5": (lambda process, burst_time: (queue_level(process.priority), burst_time), False),
+    "6": (lambda process, burst_time: burst_time, True),
+    "7": (lambda process, burst_time: process.priority, True),
+}
+
+# Lottery and stride scheduling share the CPU by tickets
+TICKETS = 100  # Tickets of a priority 1 process
+STRIDE1 = 1 << 20  # Stride of a process with one ticket (big, so strides stay whole numbers)
+
+# The time-jumping loop lives in engine.py and the ready queues live in
+# ready_queue.py, so each algorithm only says which process should go first
+# Every algorithm takes a Workload and gives back a new ScheduleResult
+# The optional checkpoints and resume arguments are only used by incremental.py,
+# which also hands in the result to carry on with (see engine.py)
+
+
+def arrival_key(process):
+    """FCFS order - earliest arrival first, processes arriving together in input order"""
+    return (process.arrival_time, process.index)
+
+
+def service_key(process):
+    """SJN order - shortest service time first"""
+    return process.service_time
+
+
+def priority_key(process):
+    """Priority order - lowest priority number first"""
+    return process.priority
+
+
+def queue_level(priority):
+    """Multi-level queue: priority 1 is the high queue, 2 is medium, everything else is low"""
+    if priority == 1:
+        return 0
+    elif priority == 2:
+        return 1
+    return 2
+
+
+def ticket_count(process):
+    """CPU share of a process - priority 1 gets TICKETS tickets, priority 2 half as many, and so on"""
+    return max(1, TICKETS // max(1, process.priority))
+
+
+def multi_level_key(process):
+    """Multi-level order - higher queue first, then shortest job first"""
+    return (queue_level(process.priority), process.service_time)
+
+
+def first_come_first_serve(workload, checkpoints=None, resume=None, result=None):
     """
     First Come First Serve (FCFS) algorithm
     The simplest algorithm - just run processes in the order they arrive
     """
-    # Start time is when the first process arrives
-    current_time = parser.get_arrival_time(parser.processes[0])
-    
-    # Go through each process in order
-    for i in range(parser.process_count):
-        process_index = i
-        arrival_time = parser.get_arrival_time(parser.processes[i])
-        service_time = parser.get_service_time(parser.processes[i])
-        
-        # Calculate when this process finishes
-        parser.finish_time[process_index] = current_time + service_time
-        
-        # Calculate turnaround time (finish time - arrival time)
-        parser.turn_around_time[process_index] = parser.finish_time[process_index] - arrival_time
-        
-        # Calculate normalized turnaround time
-        parser.norm_turn[process_index] = parser.turn_around_time[process_index] / service_time
-        
-        # Fill in the timeline - mark when process is executing
-        for j in range(current_time, parser.finish_time[process_index]):
-            parser.timeline[j][process_index] = '*'
-        
-        # Fill in the timeline - mark when process is waiting
-        for j in range(arrival_time, current_time):
-            parser.timeline[j][process_index] = '.'
-        
-        # Move to next process
-        current_time += service_time
-
-
-def shortest_job_next():
+    return run_non_preemptive(workload, result or ScheduleResult(workload), arrival_key,
+                              checkpoints=checkpoints, resume=resume)
+
+
+def shortest_job_next(workload, checkpoints=None, resume=None, result=None):
     """
     Shortest Job Next (SJN) algorithm
     Always run the process that needs the least time to complete
     """
-    # List to keep track of processes that are ready to run
-    ready_queue = []
-    process_index = 0
-    
-    # Go through each time step
-    for current_time in range(parser.last_instant):
-        # Add any newly arrived processes to our ready queue
-        while process_index < parser.process_count and parser.get_arrival_time(parser.processes[process_index]) <= current_time:
-            service_time = parser.get_service_time(parser.processes[process_index])
-            # Add to queue with service time first (so shortest comes first)
-            ready_queue.append((service_time, process_index))
-            process_index += 1
-        
-        # Sort the queue so shortest job is first
-        ready_queue.sort()
-        
-        # If there's a process ready, run it
-        if ready_queue:
-            service_time, process_index_to_execute = ready_queue.pop(0)  # Get the shortest job
-            arrival_time = parser.get_arrival_time(parser.processes[process_index_to_execute])
-            
-            # Fill in wait time in timeline
-            for temp in range(arrival_time, current_time):
-                parser.timeline[temp][process_index_to_execute] = '.'
-            
-            # Fill in execution time in timeline
-            for temp in range(current_time, current_time + service_time):
-                parser.timeline[temp][process_index_to_execute] = '*'
-            
-            # Calculate metrics
-            parser.finish_time[process_index_to_execute] = current_time + service_time
-            parser.turn_around_time[process_index_to_execute] = parser.finish_time[process_index_to_execute] - arrival_time
-            parser.norm_turn[process_index_to_execute] = parser.turn_around_time[process_index_to_execute] / service_time
-            
-            # Skip time to when this process finishes
-            current_time = current_time + service_time - 1
-
-
-def priority_scheduling():
+    # Ties go to the earlier process
+    return run_non_preemptive(workload, result or ScheduleResult(workload), service_key,
+                              checkpoints=checkpoints, resume=resume)
+
+
+def priority_scheduling(workload, checkpoints=None, resume=None, result=None):
     """
     Priority Scheduling algorithm
     Always run the process with the highest priority (lowest number)
     """
-    # List to keep track of processes that are ready to run
-    ready_queue = []
-    process_index = 0
-    
-    # Go through each time step
-    for current_time in range(parser.last_instant):
-        # Add any newly arrived processes to our ready queue
-        while process_index < parser.process_count and parser.get_arrival_time(parser.processes[process_index]) <= current_time:
-            priority = parser.get_priority(parser.processes[process_index])
-            # Add to queue with priority first (so highest priority comes first)
-            ready_queue.append((priority, process_index))
-            process_index += 1
-        
-        # Sort the queue so highest priority is first
-        ready_queue.sort()
-        
-        # If there's a process ready, run it
-        if ready_queue:
-            priority, process_index_to_execute = ready_queue.pop(0)  # Get the highest priority job
-            arrival_time = parser.get_arrival_time(parser.processes[process_index_to_execute])
-            service_time = parser.get_service_time(parser.processes[process_index_to_execute])
-            
-            # Fill in wait time in timeline
-            for temp in range(arrival_time, current_time):
-                parser.timeline[temp][process_index_to_execute] = '.'
-            
-            # Fill in execution time in timeline
-            for temp in range(current_time, current_time + service_time):
-                parser.timeline[temp][process_index_to_execute] = '*'
-            
-            # Calculate metrics
-            parser.finish_time[process_index_to_execute] = current_time + service_time
-            parser.turn_around_time[process_index_to_execute] = parser.finish_time[process_index_to_execute] - arrival_time
-            parser.norm_turn[process_index_to_execute] = parser.turn_around_time[process_index_to_execute] / service_time
-            
-            # Skip time to when this process finishes
-            current_time = current_time + service_time - 1
-
-
-def round_robin(quantum):
+    # Ties go to the earlier process
+    return run_non_preemptive(workload, result or ScheduleResult(workload), priority_key,
+                              checkpoints=checkpoints, resume=resume)
+
+
+def round_robin(workload, quantum, checkpoints=None, resume=None, result=None):
     """
     Round Robin (RR) algorithm
     Each process gets a fixed amount of time (quantum) to run
     """
-    # List to keep track of processes that are ready to run
-    ready_queue = []
-    process_index = 0
-    
-    # Add first process if it arrives at time 0
-    if parser.get_arrival_time(parser.processes[0]) == 0:
-        ready_queue.append((0, parser.get_service_time(parser.processes[0])))
-        process_index += 1
-    
-    current_quantum = quantum
-    
-    # Go through each time step
-    for current_time in range(parser.last_instant):
-        if ready_queue:
-            # Get next process from queue
-            process_index_to_execute, remaining_time = ready_queue.pop(0)
-            remaining_time -= 1  # Process runs for 1 time unit
-            current_quantum -= 1  # Quantum decreases by 1
-            
-            arrival_time = parser.get_arrival_time(parser.processes[process_index_to_execute])
-            service_time = parser.get_service_time(parser.processes[process_index_to_execute])
-            
-            # Mark this time slot as execution
-            parser.timeline[current_time][process_index_to_execute] = '*'
-            
-            # Add any new arrivals to queue
-            while process_index < parser.process_count and parser.get_arrival_time(parser.processes[process_index]) == current_time + 1:
-                ready_queue.append((process_index, parser.get_service_time(parser.processes[process_index])))
-                process_index += 1
-            
-            # Check if process finished or quantum expired
-            if current_quantum == 0 and remaining_time == 0:
-                # Process completed
-                parser.finish_time[process_index_to_execute] = current_time + 1
-                parser.turn_around_time[process_index_to_execute] = parser.finish_time[process_index_to_execute] - arrival_time
-                parser.norm_turn[process_index_to_execute] = parser.turn_around_time[process_index_to_execute] / service_time
-                current_quantum = quantum  # Reset quantum
-            elif current_quantum == 0 and remaining_time != 0:
-                # Quantum expired, add back to end of queue
-                ready_queue.append((process_index_to_execute, remaining_time))
-                current_quantum = quantum  # Reset quantum
-            elif current_quantum != 0 and remaining_time == 0:
-                # Process completed before quantum expired
-                parser.finish_time[process_index_to_execute] = current_time + 1
-                parser.turn_around_time[process_index_to_execute] = parser.finish_time[process_index_to_execute] - arrival_time
-                parser.norm_turn[process_index_to_execute] = parser.turn_around_time[process_index_to_execute] / service_time
-                current_quantum = quantum  # Reset quantum
-        
-        # Add any new arrivals to queue
-        while process_index < parser.process_count and parser.get_arrival_time(parser.processes[process_index]) == current_time + 1:
-            ready_queue.append((process_index, parser.get_service_time(parser.processes[process_index])))
-            process_index += 1
-    
-    # Fill in wait times
-    parser.fill_in_wait_time()
-
-
-def multi_level_queue():
+    if quantum <= 0:
+        raise ValueError("Round Robin needs a positive quantum")
+    if result is None:
+        result = ScheduleResult(workload, quantum=quantum)
+    processes = workload.processes
+    # Queue of (process_index, remaining_time, waiting_since) - a deque pops from the front in O(1)
+    ready_queue = deque()
+    counters = instrument.counters  # None unless instrumentation is switched on
+    last_run = None  # Process that had the CPU last
+    current_time = 0
+    if resume is not None:
+        current_time, (position, queued, last_run) = resume
+        ready_queue.extend(queued)
+    arrivals = ArrivalStream(workload, result)
+    if resume is not None:
+        arrivals.position = position
+
+    while current_time < workload.last_instant:
+        if checkpoints is not None and checkpoints.due(len(ready_queue)):
+            checkpoints.save(current_time, (arrivals.position, list(ready_queue), last_run))
+
+        # Add any newly arrived processes to the end of the queue
+        for process in arrivals.pop_arrived(current_time):
+            ready_queue.append((process.index, process.service_time, process.arrival_time))
+            if counters is not None:
+                counters["ready_queue_push"] += 1
+
+        if not ready_queue:
+            # Nothing to run - jump to the next arrival (or stop if there is none)
+            if not arrivals.has_more():
+                break
+            current_time = arrivals.next_arrival_time()
+            continue
+
+        # Get next process from queue - it has been waiting until now
+        process_index_to_execute, remaining_time, waiting_since = ready_queue.popleft()
+        result.add_interval(process_index_to_execute, waiting_since, current_time, '.')
+        if counters is not None:
+            counters["ready_queue_pop"] += 1
+            counters["decisions"] += 1
+            if process_index_to_execute != last_run:
+                counters["context_switches"] += 1
+        last_run = process_index_to_execute
+
+        # Run until the quantum expires, the process finishes or the simulation ends
+        run_time = min(quantum, remaining_time, workload.last_instant - current_time)
+        if not ready_queue:
+            # Alone on the CPU it would just get quantum after quantum
+            run_time = alone_run_time(arrivals, current_time, remaining_time, quantum, workload.last_instant)
+        result.add_interval(process_index_to_execute, current_time, current_time + run_time, '*')
+        current_time += run_time
+        remaining_time -= run_time
+
+        # Processes that arrived while this one was running go in line first
+        for process in arrivals.pop_arrived(current_time):
+            ready_queue.append((process.index, process.service_time, process.arrival_time))
+            if counters is not None:
+                counters["ready_queue_push"] += 1
+
+        if remaining_time == 0:
+            # Process completed
+            result.finish(processes[process_index_to_execute], current_time)
+            last_run = None
+        else:
+            # Quantum expired, add back to end of queue
+            ready_queue.append((process_index_to_execute, remaining_time, current_time))
+            if counters is not None:
+                counters["ready_queue_push"] += 1
+
+    return result
+
+
+def multi_level_queue(workload, checkpoints=None, resume=None, result=None):
     """
     Multi-level Queue Scheduling algorithm
     We have 3 different queues for different priority levels
     Always check high priority first, then medium, then low
     """
-    # Create three different queues for different priority levels
-    high_priority_queue = []  # Priority 1 (highest)
-    medium_priority_queue = []  # Priority 2
-    low_priority_queue = []  # Priority 3 (lowest)
-    
-    process_index = 0
-    
-    # Go through each time step
-    for current_time in range(parser.last_instant):
-        # Add any newly arrived processes to the appropriate queue
-        while process_index < parser.process_count and parser.get_arrival_time(parser.processes[process_index]) <= current_time:
-            priority = parser.get_priority(parser.processes[process_index])
-            service_time = parser.get_service_time(parser.processes[process_index])
-            
-            # Put process in the right queue based on priority
-            if priority == 1:
-                high_priority_queue.append((service_time, process_index))
-            elif priority == 2:
-                medium_priority_queue.append((service_time, process_index))
+    processes = workload.processes
+
+    # One heap per priority level, inside a level the shortest job goes first
+    ready_queue = MultiLevelReadyQueue(3, lambda process_index: queue_level(processes[process_index].priority))
+    return run_non_preemptive(workload, result or ScheduleResult(workload), service_key, ready_queue,
+                              checkpoints, resume)
+
+
+def multi_level_feedback_queue(workload, quantum, quanta=None, boost_interval=None):
+    """
+    Multi-level Feedback Queue (MLFQ) algorithm
+    Every process starts on the top level. Using up a level's quantum moves it
+    one level down, so long jobs sink and short interactive jobs stay on top.
+    A higher level always goes first, and a newcomer preempts a lower-level job
+    Every boost_interval all processes go back to the top, so nobody starves
+
+    quanta gives the quantum of each level (default: quantum, 2x, 4x ...)
+    """
+    if quanta is None:
+        quanta = [quantum * 2 ** level for level in range(MLFQ_LEVELS)]
+    if not quanta or min(quanta) <= 0:
+        raise ValueError("MLFQ needs a positive quantum for every level")
+    if boost_interval is None:
+        boost_interval = MLFQ_BOOST_QUANTA * quanta[-1]
+    bottom = len(quanta) - 1
+
+    result = ScheduleResult(workload, quantum=quantum)
+    processes = workload.processes
+    # One FIFO per level, of (process_index, remaining_time, used_at_level, waiting_since)
+    # used_at_level is how much of this level's quantum the process has already had
+    levels = [deque() for _ in quanta]
+    queued = 0  # Processes in all levels together
+    arrivals = ArrivalStream(workload, result)
+    counters = instrument.counters  # None unless instrumentation is switched on
+    last_run = None  # Process that had the CPU last
+    next_boost = boost_interval
+    current_time = 0
+
+    while current_time < workload.last_instant:
+        if current_time >= next_boost:
+            # Priority boost - everybody back to the top level, with a fresh quantum
+            boosted = deque()
+            for level in levels:
+                boosted.extend((index, remaining, 0, since) for index, remaining, used, since in level)
+                level.clear()
+            levels[0] = boosted
+            next_boost = (current_time // boost_interval + 1) * boost_interval
+            if counters is not None:
+                counters["priority_boosts"] += 1
+
+        # Newcomers start on the top level
+        for process in arrivals.pop_arrived(current_time):
+            levels[0].append((process.index, process.service_time, 0, process.arrival_time))
+            queued += 1
+            if counters is not None:
+                counters["ready_queue_push"] += 1
+
+        if not queued:
+            # Nothing to run - jump to the next arrival (or stop if there is none)
+            if not arrivals.has_more():
+                break
+            current_time = arrivals.next_arrival_time()
+            continue
+
+        # Take the first process of the highest non-empty level
+        level = 0
+        while not levels[level]:
+            level += 1
+        process_index, remaining_time, used, waiting_since = levels[level].popleft()
+        queued -= 1
+        result.add_interval(process_index, waiting_since, current_time, '.')
+        if counters is not None:
+            counters["ready_queue_pop"] += 1
+            counters["decisions"] += 1
+            if process_index != last_run:
+                counters["context_switches"] += 1
+        last_run = process_index
+
+        # Run until the quantum expires, the process finishes, a boost is due or the simulation ends
+        run_time = min(remaining_time, next_boost - current_time, workload.last_instant - current_time)
+        alone = not queued
+        if not alone:
+            run_time = min(run_time, quanta[level] - used)
+        if arrivals.has_more() and (alone or level > 0):
+            # A newcomer lands on the top level and would preempt a lower-level job,
+            # and a job that is alone has to make room for it in its own level
+            run_time = min(run_time, arrivals.next_arrival_time() - current_time)
+        result.add_interval(process_index, current_time, current_time + run_time, '*')
+        current_time += run_time
+        remaining_time -= run_time
+
+        # Use up quanta level by level - when alone the process may fall through several levels at once
+        used += run_time
+        while used >= quanta[level]:
+            used -= quanta[level]
+            level = min(level + 1, bottom)
+
+        # Processes that arrived while this one was running go in line first
+        for process in arrivals.pop_arrived(current_time):
+            levels[0].append((process.index, process.service_time, 0, process.arrival_time))
+            queued += 1
+            if counters is not None:
+                counters["ready_queue_push"] += 1
+
+        if remaining_time == 0:
+            # Process completed
+            result.finish(processes[process_index], current_time)
+            last_run = None
+        else:
+            if used == 0:
+                # Quantum used up - to the back of its (new, lower) level
+                levels[level].append((process_index, remaining_time, 0, current_time))
             else:
-                low_priority_queue.append((service_time, process_index))
-            
-            process_index += 1
-        
-        # Sort each queue so shortest jobs come first
-        high_priority_queue.sort()
-        medium_priority_queue.sort()
-        low_priority_queue.sort()
-        
-        # Execute from highest priority queue first
-        if high_priority_queue:
-            service_time, process_index_to_execute = high_priority_queue.pop(0)
-            arrival_time = parser.get_arrival_time(parser.processes[process_index_to_execute])
-            
-            # Fill wait time
-            for temp in range(arrival_time, current_time):
-                parser.timeline[temp][process_index_to_execute] = '.'
-            
-            # Fill execution time
-            for temp in range(current_time, current_time + service_time):
-                parser.timeline[temp][process_index_to_execute] = '*'
-            
-            # Calculate metrics
-            parser.finish_time[process_index_to_execute] = current_time + service_time
-            parser.turn_around_time[process_index_to_execute] = parser.finish_time[process_index_to_execute] - arrival_time
-            parser.norm_turn[process_index_to_execute] = parser.turn_around_time[process_index_to_execute] / service_time
-            
-            current_time = current_time + service_time - 1
-            
-        elif medium_priority_queue:
-            service_time, process_index_to_execute = medium_priority_queue.pop(0)
-            arrival_time = parser.get_arrival_time(parser.processes[process_index_to_execute])
-            
-            # Fill wait time
-            for temp in range(arrival_time, current_time):
-                parser.timeline[temp][process_index_to_execute] = '.'
-            
-            # Fill execution time
-            for temp in range(current_time, current_time + service_time):
-                parser.timeline[temp][process_index_to_execute] = '*'
-            
-            # Calculate metrics
-            parser.finish_time[process_index_to_execute] = current_time + service_time
-            parser.turn_around_time[process_index_to_execute] = parser.finish_time[process_index_to_execute] - arrival_time
-            parser.norm_turn[process_index_to_execute] = parser.turn_around_time[process_index_to_execute] / service_time
-            
-            current_time = current_time + service_time - 1
-            
-        elif low_priority_queue:
-            service_time, process_index_to_execute = low_priority_queue.pop(0)
-            arrival_time = parser.get_arrival_time(parser.processes[process_index_to_execute])
-            
-            # Fill wait time
-            for temp in range(arrival_time, current_time):
-                parser.timeline[temp][process_index_to_execute] = '.'
-            
-            # Fill execution time
-            for temp in range(current_time, current_time + service_time):
-                parser.timeline[temp][process_index_to_execute] = '*'
-            
-            # Calculate metrics
-            parser.finish_time[process_index_to_execute] = current_time + service_time
-            parser.turn_around_time[process_index_to_execute] = parser.finish_time[process_index_to_execute] - arrival_time
-            parser.norm_turn[process_index_to_execute] = parser.turn_around_time[process_index_to_execute] / service_time
-            
-            current_time = current_time + service_time - 1 
\ No newline at end of file
+                # Interrupted halfway through its quantum - it carries on first in its level
+                levels[level].appendleft((process_index, remaining_time, used, current_time))
+            queued += 1
+            if counters is not None:
+                counters["ready_queue_push"] += 1
+
+    return result
+
+
+def lottery_scheduling(workload, quantum, seed=0):
+    """
+    Lottery Scheduling algorithm
+    Every quantum, draw a random ticket - the process holding it runs next
+    On average each process gets CPU time in proportion to its tickets
+    The same seed always gives the same schedule
+    """
+    if quantum <= 0:
+        raise ValueError("Lottery scheduling needs a positive quantum")
+    result = ScheduleResult(workload, quantum=quantum)
+    processes = workload.processes
+    rng = random.Random(seed)
+    tickets = TicketTree(max(1, workload.process_count))  # One slot per process index
+    ready_count = 0
+    remaining = {}  # Time each ready process still needs
+    waiting_since = {}  # When each ready process started waiting
+    arrivals = ArrivalStream(workload, result)
+    counters = instrument.counters  # None unless instrumentation is switched on
+    last_run = None  # Process that had the CPU last
+    current_time = 0
+
+    while current_time < workload.last_instant:
+        for process in arrivals.pop_arrived(current_time):
+            tickets.add(process.index, ticket_count(process))
+            remaining[process.index] = process.service_time
+            waiting_since[process.index] = process.arrival_time
+            ready_count += 1
+
+        if not ready_count:
+            # Nothing to run - jump to the next arrival (or stop if there is none)
+            if not arrivals.has_more():
+                break
+            current_time = arrivals.next_arrival_time()
+            continue
+
+        if ready_count == 1:
+            # A process alone always wins, so skip the draws and run all its quanta in one go
+            process_index = tickets.find(0)
+            run_time = alone_run_time(arrivals, current_time, remaining[process_index], quantum,
+                                      workload.last_instant)
+        else:
+            process_index = tickets.find(rng.randrange(tickets.total))
+            if counters is not None:
+                counters["lottery_draws"] += 1
+            run_time = min(quantum, remaining[process_index], workload.last_instant - current_time)
+        if counters is not None:
+            counters["decisions"] += 1
+            if process_index != last_run:
+                counters["context_switches"] += 1
+        last_run = process_index
+
+        result.add_interval(process_index, waiting_since[process_index], current_time, '.')
+        result.add_interval(process_index, current_time, current_time + run_time, '*')
+        current_time += run_time
+        remaining[process_index] -= run_time
+        waiting_since[process_index] = current_time
+
+        if remaining[process_index] == 0:
+            # Process completed - its tickets leave the lottery
+            process = processes[process_index]
+            tickets.add(process_index, -ticket_count(process))
+            del remaining[process_index], waiting_since[process_index]
+            ready_count -= 1
+            result.finish(process, current_time)
+            last_run = None
+
+    return result
+
+
+def stride_scheduling(workload, quantum):
+    """
+    Stride Scheduling algorithm
+    The deterministic version of lottery scheduling: every process has a pass
+    value that grows by its stride (STRIDE1 / tickets) each quantum it runs,
+    and the process with the smallest pass runs next
+    """
+    if quantum <= 0:
+        raise ValueError("Stride scheduling needs a positive quantum")
+    result = ScheduleResult(workload, quantum=quantum)
+    processes = workload.processes
+    # Heap of (pass, arrival_number, process_index, remaining_time, waiting_since)
+    ready_queue = []
+    arrival_number = 0  # Breaks ties between equal passes - earlier arrivals first
+    global_pass = 0  # Pass of the last process that ran - newcomers start from here
+    arrivals = ArrivalStream(workload, result)
+    counters = instrument.counters  # None unless instrumentation is switched on
+    last_run = None  # Process that had the CPU last
+    current_time = 0
+
+    while current_time < workload.last_instant:
+        for process in arrivals.pop_arrived(current_time):
+            stride = STRIDE1 // ticket_count(process)
+            heapq.heappush(ready_queue, (global_pass + stride, arrival_number, process.index,
+                                         process.service_time, process.arrival_time))
+            arrival_number += 1
+            if counters is not None:
+                counters["ready_queue_push"] += 1
+
+        if not ready_queue:
+            # Nothing to run - jump to the next arrival (or stop if there is none)
+            if not arrivals.has_more():
+                break
+            current_time = arrivals.next_arrival_time()
+            continue
+
+        pass_value, number, process_index, remaining_time, waiting_since = heapq.heappop(ready_queue)
+        process = processes[process_index]
+        stride = STRIDE1 // ticket_count(process)
+        if counters is not None:
+            counters["ready_queue_pop"] += 1
+            counters["decisions"] += 1
+            if process_index != last_run:
+                counters["context_switches"] += 1
+        last_run = process_index
+
+        run_time = min(quantum, remaining_time, workload.last_instant - current_time)
+        if not ready_queue:
+            # Alone on the CPU it would win quantum after quantum
+            run_time = alone_run_time(arrivals, current_time, remaining_time, quantum, workload.last_instant)
+        result.add_interval(process_index, waiting_since, current_time, '.')
+        result.add_interval(process_index, current_time, current_time + run_time, '*')
+        current_time += run_time
+        remaining_time -= run_time
+
+        # One stride further for every quantum it used - the last of those quanta
+        # started at the pass that newcomers now start from
+        quanta_used = -(-run_time // quantum)
+        global_pass = pass_value + (quanta_used - 1) * stride
+
+        if remaining_time == 0:
+            result.finish(process, current_time)
+            last_run = None
+        else:
+            heapq.heappush(ready_queue, (pass_value + quanta_used * stride, number, process_index,
+                                         remaining_time, current_time))
+            if counters is not None:
+                counters["ready_queue_push"] += 1
+
+    return result
+
+
+def shortest_remaining_time_first(workload, checkpoints=None, resume=None, result=None):
+    """
+    Shortest Remaining Time First (SRTF) algorithm
+    Preemptive SJN - a new process takes the CPU if it needs less time
+    than what the running process has left
+    """
+    return run_preemptive(workload, result or ScheduleResult(workload),
+                          lambda process, remaining_time: remaining_time,
+                          checkpoints, resume)
+
+
+def preemptive_priority_scheduling(workload, checkpoints=None, resume=None, result=None):
+    """
+    Preemptive Priority Scheduling algorithm
+    A new process takes the CPU if its priority is higher (lower number)
+    """
+    return run_preemptive(workload, result or ScheduleResult(workload),
+                          lambda process, remaining_time: process.priority,
+                          checkpoints, resume)
+
+
+def burst_scheduling(workload, algorithm_id, quantum=-1, context_switch=0):
+    """
+    Algorithms 1-7 for processes that alternate CPU and I/O bursts, where every
+    switch to another process costs context_switch time (see engine.run_bursts)
+    """
+    if algorithm_id == "4":
+        if quantum <= 0:
+            raise ValueError("Round Robin needs a positive quantum")
+        return run_bursts(workload, ScheduleResult(workload, quantum=quantum),
+                          quantum=quantum, switch_cost=context_switch)
+    if algorithm_id not in BURST_KEYS:
+        raise ValueError(f"Algorithm {algorithm_id} can't run I/O bursts or context switch costs")
+    key_of, preemptive = BURST_KEYS[algorithm_id]
+    return run_bursts(workload, ScheduleResult(workload), key_of, preemptive, switch_cost=context_switch)
@@ -0,0 +1,108 @@
+"""
+Benchmark suite for CPU Scheduling Algorithms
+Times every algorithm on seeded synthetic workloads of growing size
+and writes one JSON line per run, so two commits can be compared
+
+Usage:
+    python benchmark.py --sizes 100,1000,10000 --kinds poisson,heavy --output results.jsonl
+    python benchmark.py --sizes 1000 --spreads 1,1000     # same jobs, 1000x longer horizon
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import parser
+from generators import KINDS, generate_workload
+from main import execute_algorithm
+
+
+def current_commit():
+    """The git commit we are benchmarking (None outside a git checkout)"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def time_run(workload, algorithm_id, quantum, repeat=1):
+    """Best wall-clock time in seconds over repeat runs"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        execute_algorithm(workload, algorithm_id, quantum, "benchmark")
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def peak_memory(workload, algorithm_id, quantum):
+    """Peak memory in bytes allocated during one run (measured separately - tracemalloc is slow)"""
+    tracemalloc.start()
+    try:
+        execute_algorithm(workload, algorithm_id, quantum, "benchmark")
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmarks(sizes, kinds, algorithms, spreads=(1,), seed=0, repeat=1, memory=True):
+    """Yield one result dictionary per (kind, size, spread, algorithm)"""
+    commit = current_commit()
+    for kind in kinds:
+        for size in sizes:
+            for spread in spreads:
+                workload = generate_workload(size, kind, seed, spread=spread)
+                for algorithm_id, quantum in algorithms:
+                    yield {
+                        "commit": commit,
+                        "python": platform.python_version(),
+                        "kind": kind,
+                        "processes": size,
+                        "horizon": workload.last_instant,
+                        "spread": spread,
+                        "seed": seed,
+                        "algorithm": algorithm_id,
+                        "quantum": quantum,
+                        "seconds": time_run(workload, algorithm_id, quantum, repeat),
+                        "peak_bytes": peak_memory(workload, algorithm_id, quantum) if memory else None,
+                    }
+
+
+def main(argv=None):
+    """Command line entry point for the benchmark suite"""
+    arguments = argparse.ArgumentParser(description="Benchmark the scheduling algorithms")
+    arguments.add_argument("--sizes", default="100,1000,10000",
+                           help="process counts, e.g. 100,1000,10000000")
+    arguments.add_argument("--kinds", default="poisson", help=f"workload kinds from {','.join(KINDS)}")
+    arguments.add_argument("--algorithms", default="1,2,3,4-2,5,6,7,8-2,9-2,10-2", help="same format as the input file")
+    arguments.add_argument("--spreads", default="1", help="horizon stretch factors, e.g. 1,1000")
+    arguments.add_argument("--seed", type=int, default=0)
+    arguments.add_argument("--repeat", type=int, default=1, help="runs per measurement (best is kept)")
+    arguments.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    arguments.add_argument("--output", help="JSON lines file (default: stdout)")
+    options = arguments.parse_args(argv)
+
+    out = open(options.output, "w") if options.output else sys.stdout
+    try:
+        for row in run_benchmarks(
+                [int(size) for size in options.sizes.split(',')],
+                options.kinds.split(','),
+                parser.parse_algorithms(options.algorithms),
+                [int(spread) for spread in options.spreads.split(',')],
+                options.seed, options.repeat, not options.no_memory):
+            out.write(json.dumps(row) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+# This is where the program starts when you run it
+if __name__ == "__main__":
+    main()
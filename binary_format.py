@@ -0,0 +1,235 @@
+"""
+Binary workload and result files for CPU Scheduling Algorithms
+A compact, columnar format that is loaded with mmap instead of being parsed
+
+Layout (little-endian, every array starts on an 8-byte boundary):
+    header   magic, version, kind, flags, count, last_instant, extra
+    workload arrival[count], service[count], priority[count] as int64,
+             name_offset[count + 1] as int64, then all names as UTF-8
+    result   finish[count], interval_offset[count + 1], interval_start[m],
+             interval_end[m] as int64, interval_state[m] as bytes,
+             then "algorithm_id,quantum" as UTF-8
+
+Loading a workload copies nothing: the columns are memoryviews over the
+mapped file and Process records are only made when a scheduler asks for one
+
+Usage:
+    python binary_format.py input.txt workload.bin     # convert a text input file
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+
+import parser
+from models import Process, ScheduleResult, Workload
+
+MAGIC = b"CPUSCHED"
+VERSION = 1
+KIND_WORKLOAD = 0
+KIND_RESULT = 1
+FLAG_ARRIVAL_SORTED = 1
+
+# magic, version, kind, flags, count, last_instant, extra
+HEADER = struct.Struct("<8sHHIqqq")
+
+
+def _align(offset):
+    """Round offset up to the next multiple of 8"""
+    return (offset + 7) & ~7
+
+
+def _int64_bytes(values):
+    """Little-endian int64 bytes of a list of numbers"""
+    column = array('q', values)
+    if sys.byteorder != "little":
+        column.byteswap()
+    return column.tobytes()
+
+
+def _write_padded(binary_file, data):
+    """Write data and pad it with zeros to an 8-byte boundary"""
+    binary_file.write(data)
+    binary_file.write(b"\0" * (_align(len(data)) - len(data)))
+
+
+def is_binary(path):
+    """Does this file start with our magic bytes?"""
+    with open(path, "rb") as binary_file:
+        return binary_file.read(len(MAGIC)) == MAGIC
+
+
+class _MappedFile:
+    """A read-only mmap of a file, cut into int64 columns"""
+
+    def __init__(self, path, expected_kind):
+        with open(path, "rb") as binary_file:
+            self.buffer = mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.buffer)
+        magic, version, kind, self.flags, self.count, self.last_instant, self.extra = \
+            HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} scheduler binary file")
+        if kind != expected_kind:
+            raise ValueError(f"{path} holds the wrong kind of data")
+        self.offset = HEADER.size
+
+    def int64_column(self, length):
+        """The next length int64 values - a memoryview, unless the byte order needs swapping"""
+        data = self.view[self.offset:self.offset + 8 * length]
+        self.offset += 8 * length
+        if sys.byteorder == "little":
+            return data.cast('q')
+        column = array('q', data.tobytes())
+        column.byteswap()
+        return column
+
+    def byte_column(self, length):
+        """The next length bytes (padded to 8)"""
+        data = self.view[self.offset:self.offset + length]
+        self.offset += _align(length)
+        return data
+
+
+class ProcessColumns:
+    """
+    Read-only sequence of Process records backed by int64 columns
+    A Process is only built the first time it is looked up, and then kept -
+    nothing else is copied. Code that only needs a column (like the arrival
+    times) can read it directly without building any Process
+    """
+
+    __slots__ = ("arrival", "service", "priority", "name_offset", "names", "mapped", "records")
+
+    def __init__(self, arrival, service, priority, name_offset, names, mapped=None):
+        self.arrival = arrival
+        self.service = service
+        self.priority = priority
+        self.name_offset = name_offset
+        self.names = names
+        self.mapped = mapped  # Keeps the mmap open as long as the columns are used
+        self.records = None  # Process records built so far (None where not built yet)
+
+    def __len__(self):
+        return len(self.arrival)
+
+    def name(self, index):
+        """Name of the process at index"""
+        return bytes(self.names[self.name_offset[index]:self.name_offset[index + 1]]).decode("utf-8")
+
+    def __getitem__(self, index):
+        records = self.records
+        if records is None:
+            records = self.records = [None] * len(self.arrival)
+        process = records[index]  # Raises IndexError for us when index is out of range
+        if process is None:
+            if index < 0:
+                index += len(records)
+            process = records[index] = Process(index, self.name(index), self.arrival[index],
+                                               self.service[index], self.priority[index])
+        return process
+
+    def __iter__(self):
+        for index in range(len(self.arrival)):
+            yield self[index]
+
+
+def save_workload(workload, path):
+    """Write a workload as a binary file"""
+    processes = list(workload.processes)
+    if any(process.bursts for process in processes):
+        raise ValueError("Binary workload files can't store I/O bursts")
+    arrivals = [process.arrival_time for process in processes]
+    flags = FLAG_ARRIVAL_SORTED if all(a <= b for a, b in zip(arrivals, arrivals[1:])) else 0
+
+    names = [process.name.encode("utf-8") for process in processes]
+    name_offset = [0]
+    for name in names:
+        name_offset.append(name_offset[-1] + len(name))
+
+    with open(path, "wb") as binary_file:
+        binary_file.write(HEADER.pack(MAGIC, VERSION, KIND_WORKLOAD, flags,
+                                      len(processes), workload.last_instant, name_offset[-1]))
+        binary_file.write(_int64_bytes(arrivals))
+        binary_file.write(_int64_bytes([process.service_time for process in processes]))
+        binary_file.write(_int64_bytes([process.priority for process in processes]))
+        binary_file.write(_int64_bytes(name_offset))
+        _write_padded(binary_file, b"".join(names))
+
+
+def load_workload(path):
+    """Map a binary workload file into a Workload without copying its columns"""
+    mapped = _MappedFile(path, KIND_WORKLOAD)
+    count = mapped.count
+    arrival = mapped.int64_column(count)
+    service = mapped.int64_column(count)
+    priority = mapped.int64_column(count)
+    name_offset = mapped.int64_column(count + 1)
+    names = mapped.byte_column(mapped.extra)
+    processes = ProcessColumns(arrival, service, priority, name_offset, names, mapped)
+    return Workload(processes, mapped.last_instant,
+                    arrival_sorted=bool(mapped.flags & FLAG_ARRIVAL_SORTED))
+
+
+def save_result(result, path, last_instant=0):
+    """Write the finish times and run intervals of a ScheduleResult as a binary file"""
+    interval_offset = [0]
+    starts, ends, states = [], [], bytearray()
+    for history in result.intervals:
+        for start, end, state in history:
+            starts.append(start)
+            ends.append(end)
+            states.append(ord(state))
+        interval_offset.append(len(starts))
+
+    with open(path, "wb") as binary_file:
+        binary_file.write(HEADER.pack(MAGIC, VERSION, KIND_RESULT, 0,
+                                      len(result.finish_time), last_instant, len(starts)))
+        binary_file.write(_int64_bytes(result.finish_time))
+        binary_file.write(_int64_bytes(interval_offset))
+        binary_file.write(_int64_bytes(starts))
+        binary_file.write(_int64_bytes(ends))
+        _write_padded(binary_file, bytes(states))
+        binary_file.write(f"{result.algorithm_id},{result.quantum}".encode("utf-8"))
+
+
+def load_result(path, workload):
+    """Read a binary result file back into a ScheduleResult for workload"""
+    mapped = _MappedFile(path, KIND_RESULT)
+    if mapped.count != workload.process_count:
+        raise ValueError(f"{path} has {mapped.count} processes, the workload has {workload.process_count}")
+    finish = mapped.int64_column(mapped.count)
+    interval_offset = mapped.int64_column(mapped.count + 1)
+    starts = mapped.int64_column(mapped.extra)
+    ends = mapped.int64_column(mapped.extra)
+    states = mapped.byte_column(mapped.extra)
+    algorithm_id, quantum = bytes(mapped.view[mapped.offset:]).decode("utf-8").rsplit(',', 1)
+
+    result = ScheduleResult(workload, algorithm_id, int(quantum))
+    for process in workload.processes:
+        i = process.index
+        for k in range(interval_offset[i], interval_offset[i + 1]):
+            result.intervals[i].append((starts[k], ends[k], chr(states[k])))
+        if finish[i]:
+            result.finish(process, finish[i])
+    return result
+
+
+def main(argv=None):
+    """Convert a text input file into a binary workload file"""
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        print("Usage: python binary_format.py input.txt workload.bin")
+        return 1
+    operation, algorithms, workload = parser.parse_file(argv[0])
+    # Make sure a streamed workload is completely read before saving it
+    while workload.load_chunk():
+        pass
+    save_workload(workload, argv[1])
+    return 0
+
+
+# This is where the program starts when you run it
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Result cache for CPU Scheduling Algorithms
+Remembers ScheduleResults on disk so the same workload and algorithm
+are never simulated twice
+
+Results are stored by a hash of their inputs (content-addressed), one file
+per result. When the folder grows past its size limit, the least recently
+used results are deleted first
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+
+# Change this whenever the algorithms change their answers, so old results are not reused
+CACHE_VERSION = 2
+
+# Hash this many processes at a time
+HASH_BATCH = 10000
+
+
+def workload_fingerprint(workload):
+    """Hash of everything in a workload that can change a schedule"""
+    # A streamed workload has to be read completely before it can be hashed
+    while workload.load_chunk():
+        pass
+
+    digest = hashlib.sha256(f"v{CACHE_VERSION};{workload.last_instant};".encode("utf-8"))
+    batch = []
+    for process in workload.processes:
+        line = f"{process.name},{process.arrival_time},{process.service_time},{process.priority}"
+        if process.bursts:
+            line += "," + ",".join(str(burst) for burst in process.bursts)
+        batch.append(line + "\n")
+        if len(batch) >= HASH_BATCH:
+            digest.update("".join(batch).encode("utf-8"))
+            batch = []
+    digest.update("".join(batch).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def result_key(fingerprint, algorithm_id, quantum, *options):
+    """Cache key of one run - the workload fingerprint plus every algorithm parameter"""
+    parameters = ",".join(str(value) for value in (algorithm_id, quantum) + options)
+    return hashlib.sha256(f"{fingerprint};{parameters}".encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """A folder of pickled ScheduleResults with least-recently-used eviction"""
+
+    def __init__(self, folder, max_bytes=256 * 1024 * 1024):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        os.makedirs(folder, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.folder, key + ".pickle")
+
+    def get(self, key):
+        """The stored result for key, or None if we don't have it"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as cache_file:
+                result = pickle.load(cache_file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        # Mark it as just used, so it is the last one to be evicted
+        os.utime(path)
+        return result
+
+    def put(self, key, result):
+        """Store a result, then evict old results if the folder is too big"""
+        # Write to a temporary file first, so a reader never sees half a result
+        handle, temporary_path = tempfile.mkstemp(dir=self.folder, suffix=".tmp")
+        with os.fdopen(handle, "wb") as cache_file:
+            pickle.dump(result, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, self._path(key))
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used results until the folder fits in max_bytes"""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.folder):
+            if entry.name.endswith(".pickle"):
+                status = entry.stat()
+                entries.append((status.st_mtime, status.st_size, entry.path))
+                total += status.st_size
+        entries.sort()
+        for modified, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Somebody else evicted it already
+            total -= size
@@ -0,0 +1,368 @@
+"""
+Event-driven simulation engine for CPU Scheduling Algorithms
+Instead of looking at every single time unit, we jump straight from
+one event (a process arriving or a process finishing) to the next one
+
+Every loop can also save checkpoints and carry on from one (see incremental.py):
+    checkpoints  object whose due(queue_size) says when to call save(time, state)
+    resume       (time, state) - continue from a saved state, in which case result
+                 must already hold everything that happened before time
+"""
+
+import heapq
+from array import array
+from collections import deque
+
+import instrument
+from ready_queue import HeapReadyQueue, IndexedHeapReadyQueue
+
+
+class ArrivalStream:
+    """
+    Hands out processes in the order they arrive
+    For a streamed workload, the next chunk is only read when we reach it
+    bursts says whether the loop can run I/O bursts - if not, a streamed-in
+    process with I/O bursts is an error instead of being run as pure CPU
+    """
+
+    def __init__(self, workload, result=None, bursts=False):
+        self.workload = workload
+        self.result = result  # Grown whenever new processes are streamed in
+        self.bursts = bursts
+        processes = workload.processes
+        # A binary workload (binary_format.ProcessColumns) has an arrival column we can
+        # read directly, so no Process is built before it arrives
+        self.arrival = getattr(processes, "arrival", None)  # Arrival times in arrival order
+        self.indices = None  # Binary workloads not in arrival order: indices in arrival order
+        if workload.arrival_sorted:
+            # Already in arrival order - for a streamed workload the list grows as we read
+            self.order = processes
+        elif self.arrival is not None:
+            # Sort the indices by the arrival column - ties keep their input order (sorted is stable)
+            self.order = processes
+            self.indices = sorted(range(len(processes)), key=self.arrival.__getitem__)
+            self.arrival = array('q', map(self.arrival.__getitem__, self.indices))
+        else:
+            # Sort by arrival time - processes arriving together keep their input order
+            self.order = sorted(processes, key=lambda process: (process.arrival_time, process.index))
+        # What to take the length of - a column's len is much cheaper than ProcessColumns.__len__
+        self.sized = self.order if self.arrival is None else self.arrival
+        self.position = 0
+
+    def has_more(self):
+        """Are there processes that have not arrived yet?"""
+        if self.position < len(self.sized):
+            return True
+        # Out of loaded processes - try to read the next chunk
+        loaded = self.workload.process_count
+        if self.workload.load_chunk():
+            if not self.bursts:
+                for process in self.workload.processes[loaded:]:
+                    if process.bursts:
+                        raise ValueError(f"Process {process.name} does I/O, but the streamed input before it "
+                                         "did not - give the process count instead of '-'")
+            if self.result is not None:
+                self.result.grow(self.workload.process_count)
+            return True
+        return False
+
+    def next_arrival_time(self):
+        """When does the next process arrive?"""
+        if self.arrival is None:
+            return self.order[self.position].arrival_time
+        return self.arrival[self.position]
+
+    def pop_arrived(self, current_time):
+        """Give back every process that has arrived by current_time"""
+        arrived = []
+        while self.has_more() and self.next_arrival_time() <= current_time:
+            if self.indices is None:
+                arrived.append(self.order[self.position])
+            else:
+                arrived.append(self.order[self.indices[self.position]])
+            self.position += 1
+        return arrived
+
+
+def alone_run_time(arrivals, current_time, remaining_time, quantum, last_instant, wake_time=None):
+    """
+    How long a process alone on the CPU runs before anyone else could get it
+    Round after round it would just get quantum after quantum, so run all of them
+    in one go - up to the first quantum boundary at or after the next arrival
+    (or at or after wake_time, when a blocked process comes back from its I/O)
+    """
+    next_event = arrivals.next_arrival_time() if arrivals.has_more() else None
+    if wake_time is not None and (next_event is None or wake_time < next_event):
+        next_event = wake_time
+    run_time = min(remaining_time, last_instant - current_time)
+    if next_event is not None:
+        # Always at least one quantum - the process got the CPU before anyone else showed up
+        quanta_until_event = max(1, -(-(next_event - current_time) // quantum))
+        run_time = min(run_time, quanta_until_event * quantum)
+    return run_time
+
+
+def run_non_preemptive(workload, result, sort_key, ready_queue=None, checkpoints=None, resume=None):
+    """
+    Run processes to completion, one at a time, and record them in result
+    sort_key(process) decides who goes first - smallest key wins
+    ready_queue can be any queue from ready_queue.py (a heap by default)
+    """
+    if ready_queue is None:
+        ready_queue = HeapReadyQueue()
+    processes = workload.processes
+    counters = instrument.counters  # None unless instrumentation is switched on
+    current_time = 0
+    if resume is not None:
+        current_time, (position, queue_state) = resume
+        ready_queue.restore(queue_state)
+    arrivals = ArrivalStream(workload, result)
+    if resume is not None:
+        arrivals.position = position
+
+    while current_time < workload.last_instant:
+        if checkpoints is not None and checkpoints.due(len(ready_queue)):
+            checkpoints.save(current_time, (arrivals.position, ready_queue.snapshot()))
+
+        # Add any newly arrived processes to our ready queue
+        arrived = arrivals.pop_arrived(current_time)
+        for process in arrived:
+            ready_queue.push(process.index, sort_key(process))
+
+        if not ready_queue:
+            # Nothing to run - jump to the next arrival (or stop if there is none)
+            if not arrivals.has_more():
+                break
+            current_time = arrivals.next_arrival_time()
+            continue
+
+        # Pick the process with the smallest key
+        process = processes[ready_queue.pop()]
+        if counters is not None:
+            # Every dispatch runs a new process to completion, so it is also a context switch
+            counters["ready_queue_push"] += len(arrived)
+            counters["ready_queue_pop"] += 1
+            counters["decisions"] += 1
+            counters["context_switches"] += 1
+
+        # Fill in the timeline - waiting until now, then executing
+        result.add_interval(process.index, process.arrival_time, current_time, '.')
+        result.add_interval(process.index, current_time, current_time + process.service_time, '*')
+
+        # Jump straight to the completion event
+        current_time += process.service_time
+        result.finish(process, current_time)
+
+    return result
+
+
+def run_preemptive(workload, result, key_of, checkpoints=None, resume=None):
+    """
+    Always run the ready process with the smallest key, switching as soon as
+    a better one arrives, and record everything in result
+    key_of(process, remaining_time) gives the key - for SRTF it shrinks as the process runs
+
+    The running process stays inside an indexed heap, so after each run we only
+    change its key (decrease-key) and the heap top tells us who runs next
+    """
+    processes = workload.processes
+    ready_queue = IndexedHeapReadyQueue()
+    remaining = {}  # Time each ready process still needs
+    ready_since = {}  # When each ready process started waiting
+    counters = instrument.counters  # None unless instrumentation is switched on
+    running = None  # Process that had the CPU last
+    current_time = 0
+    if resume is not None:
+        current_time, (position, queue_state, remaining, ready_since, running) = resume
+        ready_queue.restore(queue_state)
+        remaining = dict(remaining)
+        ready_since = dict(ready_since)
+    arrivals = ArrivalStream(workload, result)
+    if resume is not None:
+        arrivals.position = position
+
+    while current_time < workload.last_instant:
+        if checkpoints is not None and checkpoints.due(len(ready_queue)):
+            checkpoints.save(current_time, (arrivals.position, ready_queue.snapshot(),
+                                            dict(remaining), dict(ready_since), running))
+
+        # Add any newly arrived processes to our ready queue
+        arrived = arrivals.pop_arrived(current_time)
+        for process in arrived:
+            remaining[process.index] = process.service_time
+            ready_since[process.index] = process.arrival_time
+            ready_queue.push(process.index, key_of(process, process.service_time))
+
+        if not ready_queue:
+            # Nothing to run - jump to the next arrival (or stop if there is none)
+            if not arrivals.has_more():
+                break
+            current_time = arrivals.next_arrival_time()
+            continue
+
+        # The best process is on top of the heap
+        process = processes[ready_queue.peek()]
+        if counters is not None:
+            counters["ready_queue_push"] += len(arrived)
+            counters["decisions"] += 1
+            if process.index != running:
+                counters["context_switches"] += 1
+        running = process.index
+        result.add_interval(process.index, ready_since[process.index], current_time, '.')
+
+        # Run until it finishes, the next process arrives or the simulation ends
+        end_time = min(current_time + remaining[process.index], workload.last_instant)
+        if arrivals.has_more():
+            end_time = min(end_time, arrivals.next_arrival_time())
+        result.add_interval(process.index, current_time, end_time, '*')
+        remaining[process.index] -= end_time - current_time
+        current_time = end_time
+
+        if remaining[process.index] == 0:
+            # Process completed - it is still on top of the heap
+            ready_queue.pop()
+            del remaining[process.index], ready_since[process.index]
+            result.finish(process, current_time)
+            running = None
+            if counters is not None:
+                counters["ready_queue_pop"] += 1
+        else:
+            # Back to waiting, with its new key - a newcomer may now beat it
+            ready_since[process.index] = current_time
+            ready_queue.update(process.index, key_of(process, remaining[process.index]))
+            if counters is not None:
+                counters["ready_queue_update"] += 1
+
+    return result
+
+
+def run_bursts(workload, result, key_of=None, preemptive=False, quantum=-1, switch_cost=0):
+    """
+    Run processes that alternate CPU bursts with I/O bursts, and record them in result
+    key_of(process, burst_time) gives the key of a ready process - smallest key wins,
+    and burst_time is what is left of its current CPU burst
+    preemptive   re-decide whenever a process arrives or comes back from I/O
+    quantum      if positive, take turns like Round Robin instead (key_of is not used)
+    switch_cost  time the CPU loses every time it starts running a different process
+
+    A process doing I/O is blocked ('B' in the timeline). Blocked processes wait
+    in a heap ordered by when their I/O is done, so the next wake-up is always on top
+    """
+    processes = workload.processes
+    last_instant = workload.last_instant
+    round_robin = quantum > 0
+    ready_queue = deque() if round_robin else IndexedHeapReadyQueue()
+    blocked = []  # Heap of (wake_time, index) of processes doing I/O
+    position = {}  # Which burst each unfinished process is in
+    remaining = {}  # Time left in the current CPU burst of each ready process
+    ready_since = {}  # When each ready process started waiting
+    counters = instrument.counters  # None unless instrumentation is switched on
+    running = None  # Process that had the CPU last
+    requeue = None  # Round Robin: process whose quantum expired, back in line after the newcomers
+    current_time = 0
+    arrivals = ArrivalStream(workload, result, bursts=True)
+
+    while current_time < last_instant:
+        # Newcomers and processes done with their I/O become ready, in time order
+        woken = []
+        for process in arrivals.pop_arrived(current_time):
+            position[process.index] = 0
+            woken.append((process.arrival_time, process.index))
+        while blocked and blocked[0][0] <= current_time:
+            woken.append(heapq.heappop(blocked))
+        woken.sort()
+        for ready_time, index in woken:
+            process = processes[index]
+            remaining[index] = process.cpu_bursts()[position[index]]
+            ready_since[index] = ready_time
+            if round_robin:
+                ready_queue.append(index)
+            else:
+                ready_queue.push(index, key_of(process, remaining[index]))
+        if requeue is not None:
+            ready_queue.append(requeue)
+            requeue = None
+
+        # Next time a process arrives or wakes up (None if that never happens again)
+        next_event = arrivals.next_arrival_time() if arrivals.has_more() else None
+        if blocked and (next_event is None or blocked[0][0] < next_event):
+            next_event = blocked[0][0]
+
+        if not ready_queue:
+            # Nothing to run - the CPU idles until the next event (or we stop if there is none)
+            if next_event is None:
+                break
+            current_time = next_event
+            continue
+
+        if round_robin:
+            index = ready_queue.popleft()
+        elif preemptive:
+            index = ready_queue.peek()  # Stays in the heap while it runs
+        else:
+            index = ready_queue.pop()
+        process = processes[index]
+        if counters is not None:
+            counters["ready_queue_push"] += len(woken)
+            counters["decisions"] += 1
+            if not preemptive:
+                counters["ready_queue_pop"] += 1
+
+        # Switching to another process costs time - the process keeps waiting meanwhile
+        start = current_time
+        if index != running:
+            start += switch_cost
+            if counters is not None:
+                counters["context_switches"] += 1
+        running = index
+        result.add_interval(index, ready_since[index], start, '.')
+
+        end_time = start + remaining[index]
+        if round_robin and not ready_queue:
+            # Alone on the CPU it would just get quantum after quantum
+            end_time = start + alone_run_time(arrivals, start, remaining[index], quantum, last_instant,
+                                              blocked[0][0] if blocked else None)
+        elif round_robin:
+            end_time = start + min(quantum, remaining[index])
+        elif preemptive and next_event is not None and next_event < end_time:
+            # Stop at the next event, which may bring a better process - a switch
+            # that is already going on is finished first
+            end_time = max(start, next_event)
+        if round_robin or preemptive:
+            end_time = max(start, min(end_time, last_instant))
+        result.add_interval(index, start, end_time, '*')
+        remaining[index] -= end_time - start
+        current_time = end_time
+
+        if remaining[index] > 0:
+            # The CPU burst is not done - back to waiting
+            ready_since[index] = current_time
+            if round_robin:
+                requeue = index
+            else:
+                ready_queue.update(index, key_of(process, remaining[index]))
+                if counters is not None:
+                    counters["ready_queue_update"] += 1
+            continue
+
+        # The CPU burst is done
+        if preemptive:
+            ready_queue.pop()  # It is still on top of the heap
+            if counters is not None:
+                counters["ready_queue_pop"] += 1
+        del remaining[index], ready_since[index]
+        bursts = process.cpu_bursts()
+        io_position = position[index] + 1
+        if io_position < len(bursts):
+            # Block for the I/O burst, then come back for the next CPU burst
+            wake_time = current_time + bursts[io_position]
+            result.add_interval(index, current_time, wake_time, 'B')
+            position[index] = io_position + 1
+            heapq.heappush(blocked, (wake_time, index))
+            if counters is not None:
+                counters["io_blocks"] += 1
+        else:
+            del position[index]
+            result.finish(process, current_time)
+
+    return result
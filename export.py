@@ -0,0 +1,143 @@
+"""
+Export module for CPU Scheduling Algorithms
+Writes results in machine-readable form instead of the ASCII tables of output.py:
+one row per process (its times) or one row per run interval
+
+    exporter = open_exporter("results.csv", PROCESS_COLUMNS)
+    exporter.write(process_rows(workload, result))
+    exporter.close()
+
+The format comes from the file extension: .csv, .jsonl, or .arrow (an Arrow IPC
+stream, only when pyarrow is installed). Rows are made lazily and written a
+chunk at a time, so memory stays flat however big the run is
+"""
+
+import csv
+import json
+from itertools import islice
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is optional
+    pa = None
+
+# Rows are written this many at a time
+EXPORT_CHUNK = 10000
+
+# Column names and Arrow types of each kind of row
+PROCESS_COLUMNS = (
+    ("algorithm", "string"), ("process", "string"), ("arrival", "int64"), ("service", "int64"),
+    ("priority", "int64"), ("finish", "int64"), ("turnaround", "int64"), ("norm_turn", "float64"),
+    ("waiting", "int64"), ("response", "int64"), ("blocked", "int64"),
+)
+INTERVAL_COLUMNS = (
+    ("algorithm", "string"), ("process", "string"), ("start", "int64"), ("end", "int64"), ("state", "string"),
+)
+
+# What each interval state is called in the export
+STATE_NAMES = {'*': "running", '.': "waiting", 'B': "blocked"}
+
+
+def process_rows(workload, result, label):
+    """
+    One tuple per process, in PROCESS_COLUMNS order
+    Processes that did not finish have None for everything after priority
+    """
+    for process in workload.processes:
+        finish = result.finish_time[process.index]
+        if not finish:
+            yield (label, process.name, process.arrival_time, process.service_time, process.priority,
+                   None, None, None, None, None, None)
+            continue
+        first_start = None
+        blocked = 0
+        for start, end, state in result.intervals[process.index]:
+            if state == '*' and first_start is None:
+                first_start = start
+            elif state == 'B':
+                blocked += end - start
+        turn_around = result.turn_around_time[process.index]
+        yield (label, process.name, process.arrival_time, process.service_time, process.priority,
+               finish, turn_around, result.norm_turn[process.index],
+               turn_around - process.service_time - blocked, first_start - process.arrival_time, blocked)
+
+
+def interval_rows(workload, result, label):
+    """One tuple per run interval, in INTERVAL_COLUMNS order"""
+    for process in workload.processes:
+        for start, end, state in result.intervals[process.index]:
+            yield (label, process.name, start, end, STATE_NAMES.get(state, state))
+
+
+def chunks(rows, size=EXPORT_CHUNK):
+    """Split any iterable of rows into lists of up to size rows"""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class CsvExporter:
+    """Rows as CSV, with a header line"""
+
+    def __init__(self, path, columns):
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow([name for name, kind in columns])
+
+    def write(self, rows):
+        for chunk in chunks(rows):
+            self.writer.writerows(chunk)
+
+    def close(self):
+        self.file.close()
+
+
+class JsonLinesExporter:
+    """Rows as JSON objects, one per line"""
+
+    def __init__(self, path, columns):
+        self.file = open(path, "w")
+        self.names = [name for name, kind in columns]
+
+    def write(self, rows):
+        names = self.names
+        for chunk in chunks(rows):
+            self.file.write("".join(json.dumps(dict(zip(names, row))) + "\n" for row in chunk))
+
+    def close(self):
+        self.file.close()
+
+
+class ArrowExporter:
+    """Rows as an Arrow IPC stream - one record batch per chunk, column by column"""
+
+    def __init__(self, path, columns):
+        if pa is None:
+            raise ValueError("Writing .arrow files needs pyarrow (pip install pyarrow)")
+        self.schema = pa.schema([(name, pa.type_for_alias(kind)) for name, kind in columns])
+        self.sink = pa.OSFile(path, "wb")
+        self.writer = pa.ipc.new_stream(self.sink, self.schema)
+
+    def write(self, rows):
+        for chunk in chunks(rows):
+            # Turn the rows around into columns
+            columns = [pa.array(column, type=field.type) for column, field in zip(zip(*chunk), self.schema)]
+            self.writer.write_batch(pa.record_batch(columns, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+        self.sink.close()
+
+
+EXPORTERS = {".csv": CsvExporter, ".jsonl": JsonLinesExporter, ".arrow": ArrowExporter}
+
+
+def open_exporter(path, columns):
+    """The exporter for path's extension, ready to write rows with the given columns"""
+    for extension, exporter in EXPORTERS.items():
+        if path.endswith(extension):
+            return exporter(path, columns)
+    raise ValueError(f"Don't know how to export {path} - use .csv, .jsonl or .arrow")
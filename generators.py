@@ -0,0 +1,94 @@
+"""
+Synthetic workload generators for CPU Scheduling Algorithms
+Every generator takes a seed, so the same seed always gives the same workload
+
+Kinds of workload:
+- "poisson":  Poisson arrivals, exponential service times
+- "heavy":    Poisson arrivals, heavy-tailed (Pareto) service times
+- "bursty":   arrivals come in bursts with quiet gaps in between
+- "priority": Poisson arrivals, most processes low priority and a few high
+"""
+
+import random
+
+from models import Process, Workload
+
+KINDS = ("poisson", "heavy", "bursty", "priority")
+
+
+def poisson_arrivals(count, rate, rng):
+    """Arrival times of a Poisson process - exponential gaps with the given rate"""
+    arrivals = []
+    time = 0.0
+    for _ in range(count):
+        time += rng.expovariate(rate)
+        arrivals.append(int(time))
+    return arrivals
+
+
+def bursty_arrivals(count, rate, rng, burst_size=20):
+    """Arrival times that come in bursts - a burst arrives almost at once, then a long gap"""
+    arrivals = []
+    time = 0.0
+    while len(arrivals) < count:
+        # The gap is long enough to keep the same average rate as poisson_arrivals
+        time += rng.expovariate(rate / burst_size)
+        for _ in range(min(burst_size, count - len(arrivals))):
+            time += rng.expovariate(rate * 10)
+            arrivals.append(int(time))
+    return arrivals
+
+
+def exponential_service(count, mean, rng):
+    """Service times with an exponential distribution (at least 1)"""
+    return [max(1, round(rng.expovariate(1 / mean))) for _ in range(count)]
+
+
+def heavy_tailed_service(count, mean, rng, alpha=1.5):
+    """Service times with a Pareto distribution - most are short, a few are huge"""
+    # A Pareto with shape alpha and scale x_m has mean alpha * x_m / (alpha - 1)
+    scale = mean * (alpha - 1) / alpha
+    return [max(1, round(scale * rng.paretovariate(alpha))) for _ in range(count)]
+
+
+def skewed_priorities(count, rng, levels=3, high_share=0.1):
+    """Priorities where only high_share of processes get the top priority (1)"""
+    priorities = []
+    for _ in range(count):
+        if rng.random() < high_share:
+            priorities.append(1)
+        else:
+            priorities.append(rng.randint(2, levels))
+    return priorities
+
+
+def generate_workload(count, kind="poisson", seed=0, mean_service=5, load=0.9, spread=1):
+    """
+    Make a random Workload with count processes
+    load is how busy the CPU should be on average (0.9 = 90%)
+    spread stretches every arrival time, giving a longer horizon with the same processes
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown workload kind: {kind}")
+    rng = random.Random(seed)
+    rate = load / mean_service  # Arrivals per time unit
+
+    if kind == "bursty":
+        arrivals = bursty_arrivals(count, rate, rng)
+    else:
+        arrivals = poisson_arrivals(count, rate, rng)
+    if kind == "heavy":
+        services = heavy_tailed_service(count, mean_service, rng)
+    else:
+        services = exponential_service(count, mean_service, rng)
+    if kind == "priority":
+        priorities = skewed_priorities(count, rng)
+    else:
+        priorities = [rng.randint(1, 3) for _ in range(count)]
+
+    processes = [Process(i, f"P{i}", arrivals[i] * spread, services[i], priorities[i])
+                 for i in range(count)]
+
+    # Long enough for every process to finish, whatever the algorithm
+    last_instant = (arrivals[-1] * spread if count else 0) + sum(services) + 1
+    return Workload(processes, last_instant)
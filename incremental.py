@@ -0,0 +1,179 @@
+"""
+Incremental re-simulation for CPU Scheduling Algorithms
+Edit one process of a workload and get the new schedule without
+simulating everything again from time 0
+
+While the first run goes, the simulator state is saved every few events
+(a checkpoint). A process can't change anything before it arrives, so after
+an edit we carry on from the last checkpoint taken before the earliest
+arrival time involved (old or new) and only simulate from there
+
+Usage:
+    simulation = IncrementalSimulation(workload, "6")
+    result = simulation.edit(42, service_time=7)               # keep the change
+    result = simulation.edit(42, priority=1, keep=False)       # what-if only
+"""
+
+import bisect
+
+from algorithms import (
+    first_come_first_serve, shortest_job_next, priority_scheduling,
+    round_robin, multi_level_queue, shortest_remaining_time_first,
+    preemptive_priority_scheduling
+)
+from models import Process, ScheduleResult, Workload
+
+# Save a checkpoint every this many scheduling events
+# More often makes edits faster, but keeps more states in memory
+CHECKPOINT_EVERY = 256
+
+
+class Checkpoints:
+    """Simulator states saved during one run, in time order"""
+
+    def __init__(self, every=CHECKPOINT_EVERY, times=None, states=None):
+        self.every = every
+        self.events = 0  # Events since the last checkpoint
+        self.times = times or []
+        self.states = states or []
+
+    def due(self, queue_size):
+        """
+        Called by the simulator once per event - is it time to save?
+        A big ready queue is expensive to copy, so we wait at least that many
+        events, which keeps the copying to O(1) per event on average
+        """
+        self.events += 1
+        if self.events < max(self.every, queue_size):
+            return False
+        self.events = 0
+        return True
+
+    def save(self, current_time, state):
+        """Store the simulator state at current_time"""
+        self.times.append(current_time)
+        self.states.append(state)
+
+    def last_before(self, time):
+        """Position of the last checkpoint taken before time, or -1 if there is none"""
+        return bisect.bisect_left(self.times, time) - 1
+
+    def first(self, count):
+        """New Checkpoints holding only the first count checkpoints"""
+        return Checkpoints(self.every, self.times[:count], self.states[:count])
+
+
+def run_algorithm(workload, algorithm_id, quantum=-1, checkpoints=None, resume=None, result=None):
+    """Run one single-CPU algorithm, saving checkpoints or carrying on from one"""
+    if algorithm_id == "1":
+        result = first_come_first_serve(workload, checkpoints, resume, result)
+    elif algorithm_id == "2":
+        result = shortest_job_next(workload, checkpoints, resume, result)
+    elif algorithm_id == "3":
+        result = priority_scheduling(workload, checkpoints, resume, result)
+    elif algorithm_id == "4":
+        result = round_robin(workload, quantum, checkpoints, resume, result)
+    elif algorithm_id == "5":
+        result = multi_level_queue(workload, checkpoints, resume, result)
+    elif algorithm_id == "6":
+        result = shortest_remaining_time_first(workload, checkpoints, resume, result)
+    elif algorithm_id == "7":
+        result = preemptive_priority_scheduling(workload, checkpoints, resume, result)
+    else:
+        raise ValueError(f"Algorithm {algorithm_id} can't be re-simulated incrementally")
+    result.algorithm_id = algorithm_id
+    result.quantum = quantum
+    return result
+
+
+def result_before(result, workload, time):
+    """
+    The part of result that had already been recorded when the simulator
+    reached time - this is the result a checkpoint at time goes with
+    """
+    # Processes done by then keep everything - their histories are never changed again, so share them
+    done = [0 < finish <= time for finish in result.finish_time]
+    columns = ([finish if is_done else 0 for finish, is_done in zip(result.finish_time, done)],
+               [value if is_done else 0 for value, is_done in zip(result.turn_around_time, done)],
+               [value if is_done else 0.0 for value, is_done in zip(result.norm_turn, done)],
+               [history if is_done else _history_before(history, time)
+                for history, is_done in zip(result.intervals, done)])
+    return ScheduleResult(workload, result.algorithm_id, result.quantum, columns)
+
+
+def _history_before(history, time):
+    """
+    The runs of one unfinished process that were recorded before time
+    A waiting run is only recorded when the process gets the CPU, so any
+    '.' run ending at time or later is left out (the checkpoint still knows
+    since when the process waits). A '*' run going past time is cut at time
+    """
+    kept = []
+    for start, end, state in history:
+        if start >= time:
+            break
+        if state == '*':
+            kept.append((start, min(end, time), state))
+        elif end < time:
+            kept.append((start, end, state))
+    return kept
+
+
+class IncrementalSimulation:
+    """One algorithm on one workload, which can be edited and re-run cheaply"""
+
+    def __init__(self, workload, algorithm_id, quantum=-1, every=CHECKPOINT_EVERY):
+        # A streamed workload has to be read completely before we can edit it
+        while workload.load_chunk():
+            pass
+        processes = workload.processes
+        if workload.has_bursts:
+            raise ValueError("Workloads with I/O bursts can't be re-simulated incrementally")
+        # Every edit runs a new ArrivalStream, so find out once whether it needs to sort
+        arrival_sorted = workload.arrival_sorted or all(
+            processes[i].arrival_time <= processes[i + 1].arrival_time for i in range(len(processes) - 1))
+        self.workload = Workload(processes, workload.last_instant, arrival_sorted=arrival_sorted)
+        self.algorithm_id = algorithm_id
+        self.quantum = quantum
+        self.checkpoints = Checkpoints(every)
+        self.result = run_algorithm(self.workload, algorithm_id, quantum, self.checkpoints)
+
+    def edit(self, process_index, arrival_time=None, service_time=None, priority=None, keep=True):
+        """
+        Change one process and return the new ScheduleResult
+        The result is exactly what a full run of the edited workload gives
+        With keep=False the simulation stays as it was (a what-if question)
+        """
+        old = self.workload.processes[process_index]
+        new = Process(process_index, old.name,
+                      old.arrival_time if arrival_time is None else arrival_time,
+                      old.service_time if service_time is None else service_time,
+                      old.priority if priority is None else priority)
+        if new.service_time <= 0:
+            raise ValueError(f"Process {new.name} needs a positive service time")
+
+        processes = list(self.workload.processes)
+        processes[process_index] = new
+        arrival_sorted = self.workload.arrival_sorted and (
+            (process_index == 0 or processes[process_index - 1].arrival_time <= new.arrival_time) and
+            (process_index == len(processes) - 1 or new.arrival_time <= processes[process_index + 1].arrival_time))
+        workload = Workload(processes, self.workload.last_instant, arrival_sorted=arrival_sorted)
+
+        # Nothing can differ before the edited process arrives (at its old or its new time)
+        position = self.checkpoints.last_before(min(old.arrival_time, new.arrival_time))
+        if position < 0:
+            checkpoints = Checkpoints(self.checkpoints.every)
+            resume = None
+            result = None
+        else:
+            checkpoints = self.checkpoints.first(position + 1)
+            time = checkpoints.times[position]
+            resume = (time, checkpoints.states[position])
+            result = result_before(self.result, workload, time)
+        result = run_algorithm(workload, self.algorithm_id, self.quantum, checkpoints, resume, result)
+
+        if keep:
+            self.workload = workload
+            self.checkpoints = checkpoints
+            self.result = result
+        return result
@@ -0,0 +1,89 @@
+"""
+Instrumentation for CPU Scheduling Algorithms
+Opt-in timers and counters to find out where a simulation spends its time
+
+When instrumentation is off, counters and phase_times are None and the
+scheduler loops only do one "is not None" check per decision, so it costs
+(almost) nothing
+"""
+
+import cProfile
+import io
+import pstats
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+counters = None  # Counter of events (queue operations, context switches, ...) or None
+phase_times = None  # Seconds spent in each phase (parse, schedule, metrics, render) or None
+
+
+def enable():
+    """Start collecting timers and counters (clears anything collected before)"""
+    global counters, phase_times
+    counters = Counter()
+    phase_times = {}
+
+
+def disable():
+    """Stop collecting"""
+    global counters, phase_times
+    counters = None
+    phase_times = None
+
+
+@contextmanager
+def phase(name):
+    """Time a block of code and add it to phase_times[name]"""
+    if phase_times is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phase_times[name] = phase_times.get(name, 0.0) + time.perf_counter() - start
+
+
+def print_report(out=None):
+    """Print the collected phase timers and counters"""
+    if out is None:
+        out = sys.stderr
+    if phase_times is None:
+        return
+    rows = ["Phase        | Seconds\n"]
+    rows.extend(f"{name:<12} | {seconds:.6f}\n" for name, seconds in phase_times.items())
+    rows.append("Counter                  | Count\n")
+    rows.extend(f"{name:<24} | {count}\n" for name, count in sorted(counters.items()))
+    out.write("".join(rows))
+
+
+def profile_run(function, report_path, *args, top=30):
+    """
+    Run function(*args) under cProfile and tracemalloc and write a text report
+    Returns whatever function returns
+    """
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    try:
+        profiler.enable()
+        try:
+            value = function(*args)
+        finally:
+            profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    report = io.StringIO()
+    report.write("=== CPU profile (sorted by cumulative time) ===\n")
+    pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(top)
+    report.write(f"=== Memory: peak {peak} bytes, still allocated {current} bytes ===\n")
+    for statistic in snapshot.statistics("lineno")[:top]:
+        report.write(f"{statistic}\n")
+    with open(report_path, "w") as report_file:
+        report_file.write(report.getvalue())
+    return value
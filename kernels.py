@@ -0,0 +1,196 @@
+"""
+Array kernels for CPU Scheduling Algorithms
+Fast versions of FCFS, SJN and Priority for big workloads
+
+The reference algorithms (engine.run_non_preemptive) look at Process records
+one attribute at a time. These kernels work on flat int64 columns of arrival,
+service and priority instead, and give exactly the same ScheduleResult:
+- FCFS on processes already in arrival order is a running maximum over prefix
+  sums, which NumPy does without any Python loop
+- everything else is one scan over the arrival order with a heap of plain
+  ints (key and arrival position packed into one number) - no tuples and no
+  Process records
+The result keeps arrival, start and finish as columns too, and only makes the
+run intervals of a process when output or export asks for them (RunIntervals)
+
+main.execute_algorithm picks these automatically for workloads with at least
+KERNEL_THRESHOLD processes. NumPy is optional - without it the FCFS scan is
+a plain Python loop over the arrays
+"""
+
+import heapq
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+from models import ScheduleResult
+
+# Workloads with at least this many processes use the kernels
+KERNEL_THRESHOLD = 10000
+
+# Algorithms that have a kernel
+KERNEL_ALGORITHMS = ("1", "2", "3")
+
+
+def workload_columns(workload):
+    """Arrival, service and priority of every process as flat int64 arrays"""
+    processes = workload.processes
+    if hasattr(processes, "arrival"):
+        # binary_format.ProcessColumns already is columns - use them as they are
+        return processes.arrival, processes.service, processes.priority
+    return (array('q', [process.arrival_time for process in processes]),
+            array('q', [process.service_time for process in processes]),
+            array('q', [process.priority for process in processes]))
+
+
+def is_sorted(values):
+    """Is values in non-decreasing order?"""
+    if np is not None:
+        values = np.asarray(values)
+        return bool((values[1:] >= values[:-1]).all())
+    return all(values[i] <= values[i + 1] for i in range(len(values) - 1))
+
+
+def fcfs_sorted_starts(arrival, service, last_instant):
+    """
+    Start times of FCFS on processes in arrival order, -1 for the ones that never start
+    A process starts when it arrives or when the one before it finishes, whichever is later
+    (and never before time 0):
+        start[i] = done_before[i] + max(0, max(arrival[j] - done_before[j] for j <= i))
+    where done_before[i] is the total service of the processes before i
+    """
+    count = len(arrival)
+    if np is not None:
+        arrival = np.asarray(arrival, dtype=np.int64)
+        service = np.asarray(service, dtype=np.int64)
+        done_before = np.cumsum(service) - service
+        start = done_before + np.maximum(np.maximum.accumulate(arrival - done_before), 0)
+        start[start >= last_instant] = -1  # The simulation ends before they get the CPU
+        return start
+    start = array('q', [0]) * count
+    current_time = 0
+    for i in range(count):
+        if arrival[i] > current_time:
+            current_time = arrival[i]
+        if current_time >= last_instant:
+            for j in range(i, count):
+                start[j] = -1
+            break
+        start[i] = current_time
+        current_time += service[i]
+    return start
+
+
+def heap_scan_starts(arrival, service, keys, last_instant, arrival_sorted):
+    """
+    Start times of a non-preemptive algorithm, -1 for processes that never start
+    Smallest key runs first, ties go to whoever arrived first - the same order
+    as run_non_preemptive with a HeapReadyQueue
+    """
+    count = len(arrival)
+    if arrival_sorted:
+        order = range(count)
+    else:
+        order = sorted(range(count), key=lambda index: (arrival[index], index))
+    # key << shift + position sorts like (key, position), even for negative keys
+    shift = count.bit_length()
+    mask = (1 << shift) - 1
+
+    start = array('q', [-1]) * count
+    ready = []
+    current_time = 0
+    position = 0
+    while current_time < last_instant:
+        # Add any newly arrived processes to the heap
+        while position < count and arrival[order[position]] <= current_time:
+            heapq.heappush(ready, (keys[order[position]] << shift) + position)
+            position += 1
+        if not ready:
+            # Nothing to run - jump to the next arrival (or stop if there is none)
+            if position == count:
+                break
+            current_time = arrival[order[position]]
+            continue
+        index = order[heapq.heappop(ready) & mask]
+        start[index] = current_time
+        current_time += service[index]
+    return start
+
+
+def int64_column(values):
+    """Copy of any sequence of int64 (list, array, NumPy array or mmapped column) as a compact array"""
+    column = array('q')
+    if np is not None:
+        column.frombytes(np.asarray(values, dtype=np.int64).tobytes())
+    else:
+        column.extend(values)
+    return column
+
+
+class RunIntervals:
+    """
+    The intervals of a kernel result, worked out per process only when asked for
+    A process waits from arrival to start and runs from start to finish, so three
+    int64 columns are all that is kept - no list of tuples for every process
+    (empty runs are left out, like ScheduleResult.add_interval does)
+    """
+
+    __slots__ = ("arrival", "start", "finish")
+
+    def __init__(self, arrival, start, finish):
+        self.arrival = arrival
+        self.start = start  # -1 for processes that never ran
+        self.finish = finish
+
+    def __len__(self):
+        return len(self.start)
+
+    def __getitem__(self, index):
+        came, begin, end = self.arrival[index], self.start[index], self.finish[index]
+        if begin < 0:
+            return []
+        if came < begin:
+            return [(came, begin, '.'), (begin, end, '*')]
+        return [(begin, end, '*')] if begin < end else []
+
+    def __iter__(self):
+        for index in range(len(self.start)):
+            yield self[index]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+
+def build_result(workload, arrival, service, start):
+    """ScheduleResult of processes that run from start to start + service (start -1: never ran)"""
+    if np is not None:
+        arrival = np.asarray(arrival, dtype=np.int64)
+        service = np.asarray(service, dtype=np.int64)
+        start = np.asarray(start, dtype=np.int64)
+        ran = start >= 0
+        finish = np.where(ran, start + service, 0)
+        turn_around = np.where(ran, finish - arrival, 0)
+        columns = (finish.tolist(), turn_around.tolist(), (turn_around / service).tolist(),
+                   RunIntervals(int64_column(arrival), int64_column(start), int64_column(finish)))
+    else:
+        finish = array('q', [begin + length if begin >= 0 else 0 for begin, length in zip(start, service)])
+        turn_around = [end - came if end else 0 for end, came in zip(finish, arrival)]
+        columns = (finish.tolist(), turn_around, [turn / length for turn, length in zip(turn_around, service)],
+                   RunIntervals(int64_column(arrival), int64_column(start), finish))
+    return ScheduleResult(workload, columns=columns)
+
+
+def run_kernel(workload, algorithm_id):
+    """FCFS (1), SJN (2) or Priority (3) on a fully loaded workload, with the array kernels"""
+    arrival, service, priority = workload_columns(workload)
+    arrival_sorted = workload.arrival_sorted or is_sorted(arrival)
+    if algorithm_id == "1" and arrival_sorted:
+        start = fcfs_sorted_starts(arrival, service, workload.last_instant)
+    else:
+        # Ties already go to the earlier arrival, so FCFS needs no key of its own
+        keys = {"1": array('q', [0]) * len(arrival), "2": service, "3": priority}[algorithm_id]
+        start = heap_scan_starts(arrival, service, keys, workload.last_instant, arrival_sorted)
+    return build_result(workload, arrival, service, start)
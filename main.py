@@ -3,84 +3,257 @@ Main module for CPU Scheduling Algorithms
 This is the main program that runs everything
 """
 
+import argparse
+
+import cache
+import export
+import instrument
 import parser
 from algorithms import (
     first_come_first_serve, shortest_job_next, priority_scheduling,
-    round_robin, multi_level_queue
+    round_robin, multi_level_queue, shortest_remaining_time_first,
+    preemptive_priority_scheduling, multi_level_feedback_queue,
+    lottery_scheduling, stride_scheduling, burst_scheduling
 )
-from output import print_timeline, print_stats
+from kernels import KERNEL_ALGORITHMS, KERNEL_THRESHOLD, run_kernel
+from metrics import compute_metrics
+from output import algorithm_label, print_timeline, print_stats, print_metrics, print_core_stats, print_comparison
+from smp import SMP_KEYS, SMP_PREEMPTIVE_KEYS, POLICIES, run_smp, run_smp_preemptive
 
 
-def execute_algorithm(algorithm_id, quantum, operation):
+def print_trace_label(algorithm_id, quantum, out=None):
+    """Print the algorithm name in front of the timeline header (to stdout if out is None)"""
+    if algorithm_id == "1":
+        print("FCFS  ", end="", file=out)  # First Come First Serve
+    elif algorithm_id == "2":
+        print("SJN   ", end="", file=out)  # Shortest Job Next
+    elif algorithm_id == "3":
+        print("Priority ", end="", file=out)  # Priority Scheduling
+    elif algorithm_id == "4":
+        print(f"RR-{quantum}  ", end="", file=out)  # Round Robin with quantum
+    elif algorithm_id == "5":
+        print("Multi-Level ", end="", file=out)  # Multi-level Queue
+    elif algorithm_id == "6":
+        print("SRTF  ", end="", file=out)  # Shortest Remaining Time First
+    elif algorithm_id == "7":
+        print("Preemptive-Priority ", end="", file=out)  # Preemptive Priority
+    elif algorithm_id == "8":
+        print(f"MLFQ-{quantum}  ", end="", file=out)  # Multi-level Feedback Queue with base quantum
+    elif algorithm_id == "9":
+        print(f"Lottery-{quantum}  ", end="", file=out)  # Lottery Scheduling with quantum
+    elif algorithm_id == "10":
+        print(f"Stride-{quantum}  ", end="", file=out)  # Stride Scheduling with quantum
+
+
+def execute_algorithm(workload, algorithm_id, quantum, operation,
+                      cores=1, smp_policy="global", migration_cost=0, seed=0, context_switch=0):
     """
-    Execute the specified algorithm
+    Execute the specified algorithm and return its ScheduleResult
     This function decides which algorithm to run based on the algorithm_id
+    With cores > 1 the algorithm runs on several CPUs (see smp.py)
+    seed drives the random draws of lottery scheduling
+    Processes with I/O bursts, or a context_switch cost, need burst_scheduling
     """
     # Print the algorithm name if we're in trace mode
     if operation == "trace":
-        if algorithm_id == "1":
-            print("FCFS  ", end="")  # First Come First Serve
-        elif algorithm_id == "2":
-            print("SJN   ", end="")  # Shortest Job Next
-        elif algorithm_id == "3":
-            print("Priority ", end="")  # Priority Scheduling
-        elif algorithm_id == "4":
-            print(f"RR-{quantum}  ", end="")  # Round Robin with quantum
-        elif algorithm_id == "5":
-            print("Multi-Level ", end="")  # Multi-level Queue
-    
+        print_trace_label(algorithm_id, quantum)
+
+    # A streamed workload has nothing loaded yet - read the first chunk, so we
+    # can see whether its processes do I/O (later chunks are checked as they come)
+    if workload.source is not None and not workload.processes:
+        workload.load_chunk()
+
     # Run the appropriate algorithm based on the algorithm_id
-    if algorithm_id == "1":
-        first_come_first_serve()
+    if cores > 1:
+        if algorithm_id not in SMP_KEYS and algorithm_id != "4" and algorithm_id not in SMP_PREEMPTIVE_KEYS:
+            raise ValueError(f"Algorithm {algorithm_id} can't run on several cores")
+        if context_switch > 0 or workload.has_bursts:
+            raise ValueError("Several cores can't run I/O bursts or context switch costs yet")
+        if algorithm_id in SMP_KEYS:
+            result = run_smp(workload, SMP_KEYS[algorithm_id], cores, smp_policy, migration_cost)
+        else:
+            # Round Robin takes turns, SRTF and Preemptive Priority go by their key
+            result = run_smp_preemptive(workload, SMP_PREEMPTIVE_KEYS.get(algorithm_id), cores,
+                                        smp_policy, migration_cost, quantum)
+    elif context_switch > 0 or workload.has_bursts:
+        result = burst_scheduling(workload, algorithm_id, quantum, context_switch)
+    elif (algorithm_id in KERNEL_ALGORITHMS and workload.source is None and
+          workload.process_count >= KERNEL_THRESHOLD and instrument.counters is None):
+        # Big and fully loaded - the array kernels give the same result much faster
+        # (they count nothing, so --instrument keeps the reference algorithms)
+        result = run_kernel(workload, algorithm_id)
+    elif algorithm_id == "1":
+        result = first_come_first_serve(workload)
     elif algorithm_id == "2":
-        shortest_job_next()
+        result = shortest_job_next(workload)
     elif algorithm_id == "3":
-        priority_scheduling()
+        result = priority_scheduling(workload)
     elif algorithm_id == "4":
-        round_robin(quantum)
+        result = round_robin(workload, quantum)
     elif algorithm_id == "5":
-        multi_level_queue()
+        result = multi_level_queue(workload)
+    elif algorithm_id == "6":
+        result = shortest_remaining_time_first(workload)
+    elif algorithm_id == "7":
+        result = preemptive_priority_scheduling(workload)
+    elif algorithm_id == "8":
+        result = multi_level_feedback_queue(workload, quantum)
+    elif algorithm_id == "9":
+        result = lottery_scheduling(workload, quantum, seed)
+    elif algorithm_id == "10":
+        result = stride_scheduling(workload, quantum)
+    else:
+        raise ValueError(f"Unknown algorithm: {algorithm_id}")
+
+    # Remember which algorithm made this result
+    result.algorithm_id = algorithm_id
+    result.quantum = quantum
+    return result
 
 
-def main():
+def execute_cached(result_cache, fingerprint, workload, algorithm_id, quantum, operation,
+                   cores=1, smp_policy="global", migration_cost=0, seed=0, context_switch=0):
     """
-    Main function - this is where the program starts
+    Like execute_algorithm, but reuse a stored result when the same workload
+    and parameters were already simulated
     """
+    key = cache.result_key(fingerprint, algorithm_id, quantum, cores, smp_policy, migration_cost, seed,
+                           context_switch)
+    result = result_cache.get(key)
+    if result is None:
+        result = execute_algorithm(workload, algorithm_id, quantum, operation,
+                                   cores, smp_policy, migration_cost, seed, context_switch)
+        result_cache.put(key, result)
+    elif operation == "trace":
+        print_trace_label(algorithm_id, quantum)
+    return result
+
+
+def print_result(workload, result, operation, metrics=None, out=None):
+    """Show one result the way the operation asks for (on stdout if out is None)"""
+    if operation == "trace":
+        print_timeline(workload, result, out)  # Show the timeline
+    elif operation == "stats":
+        print_stats(workload, result, out)  # Show the statistics
+    elif operation == "metrics":
+        print_metrics(result, metrics, out)  # Show the summary metrics
+
+    if result.core_stats is not None:
+        print_core_stats(result.core_stats, out)  # Show how busy each core was
+
+    print(file=out)  # Empty line between algorithms
+
+
+def run(options):
+    """Read the input, run every algorithm and print the results"""
+    exporters = []
     try:
         # Step 1: Read all the input data
-        parser.parse()
-        
-        # Step 2: Get the data we need
-        operation = parser.operation  # "trace" or "stats"
-        algorithms = parser.algorithms  # List of algorithms to run
-        
-        # Step 3: Run each algorithm
-        for idx in range(len(algorithms)):
-            # Clear the timeline for this algorithm
-            parser.clear_timeline()
-            
-            # Get which algorithm to run and its parameters
-            algorithm_id = algorithms[idx][0]  # Which algorithm (1-5)
-            quantum = algorithms[idx][1]  # Quantum for Round Robin
-            
-            # Run the algorithm
-            execute_algorithm(algorithm_id, quantum, operation)
-            
+        with instrument.phase("parse"):
+            operation, algorithms, workload = parser.parse()
+            if operation == "compare":
+                # Every algorithm shares the same read-only workload
+                workload.freeze()
+        comparison = []  # (label, metrics) of each algorithm when comparing
+
+        # Machine-readable copies of every result, as (exporter, rows function)
+        if options.export_processes:
+            exporters.append((export.open_exporter(options.export_processes, export.PROCESS_COLUMNS),
+                              export.process_rows))
+        if options.export_intervals:
+            exporters.append((export.open_exporter(options.export_intervals, export.INTERVAL_COLUMNS),
+                              export.interval_rows))
+
+        result_cache = None
+        if options.cache:
+            result_cache = cache.ResultCache(options.cache, options.cache_size * 1024 * 1024)
+            fingerprint = cache.workload_fingerprint(workload)
+
+        # Step 2: Run each algorithm
+        for algorithm_id, quantum in algorithms:
+            # Run the algorithm - every run gets its own fresh result
+            with instrument.phase("schedule"):
+                if result_cache is not None:
+                    result = execute_cached(result_cache, fingerprint, workload, algorithm_id, quantum,
+                                            operation, options.cores, options.smp_policy,
+                                            options.migration_cost, options.seed, options.context_switch)
+                else:
+                    result = execute_algorithm(workload, algorithm_id, quantum, operation,
+                                               options.cores, options.smp_policy, options.migration_cost,
+                                               options.seed, options.context_switch)
+
+            if exporters:
+                with instrument.phase("export"):
+                    label = algorithm_label(algorithm_id, quantum)
+                    for exporter, rows in exporters:
+                        exporter.write(rows(workload, result, label))
+
+            metrics = None
+            if operation in ("metrics", "compare"):
+                with instrument.phase("metrics"):
+                    metrics = compute_metrics(workload, result)
+
+            if operation == "compare":
+                # Keep it until every algorithm has run, then show them side by side
+                comparison.append((algorithm_label(algorithm_id, quantum), metrics))
+                continue
+
             # Show the results
-            if operation == "trace":
-                print_timeline(idx)  # Show the timeline
-            elif operation == "stats":
-                print_stats(idx)  # Show the statistics
-            
-            print()  # Empty line between algorithms
-            
+            with instrument.phase("render"):
+                print_result(workload, result, operation, metrics)
+
+        if comparison:
+            with instrument.phase("render"):
+                print_comparison(comparison)
+
     except Exception as e:
         # If something goes wrong, show the error
         print(f"Error: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        for exporter, rows in exporters:
+            exporter.close()
+
+
+def main(argv=None):
+    """
+    Main function - this is where the program starts
+    """
+    arguments = argparse.ArgumentParser(description="CPU scheduling simulator (reads its input from stdin)")
+    arguments.add_argument("--cores", type=int, default=1, help="number of CPUs to simulate")
+    arguments.add_argument("--smp-policy", choices=POLICIES, default="global",
+                           help="one global run queue, or per-core queues with work stealing")
+    arguments.add_argument("--migration-cost", type=int, default=0,
+                           help="time it takes to move a stolen process to another core")
+    arguments.add_argument("--seed", type=int, default=0,
+                           help="random seed for lottery scheduling (same seed, same schedule)")
+    arguments.add_argument("--context-switch", type=int, default=0, metavar="TIME",
+                           help="time the CPU loses every time it switches to another process")
+    arguments.add_argument("--export-processes", metavar="FILE",
+                           help="also write every process's times to FILE (.csv, .jsonl or .arrow)")
+    arguments.add_argument("--export-intervals", metavar="FILE",
+                           help="also write every run interval to FILE (.csv, .jsonl or .arrow)")
+    arguments.add_argument("--cache", metavar="FOLDER",
+                           help="reuse results stored in this folder (and store new ones there)")
+    arguments.add_argument("--cache-size", type=int, default=256, metavar="MB",
+                           help="largest the cache folder may grow before old results are deleted")
+    arguments.add_argument("--instrument", action="store_true",
+                           help="print phase timers and scheduler counters to stderr")
+    arguments.add_argument("--profile", metavar="REPORT",
+                           help="run under cProfile and tracemalloc and write a report to this file")
+    options = arguments.parse_args(argv)
+
+    if options.instrument:
+        instrument.enable()
+    if options.profile:
+        instrument.profile_run(run, options.profile, options)
+    else:
+        run(options)
+    if options.instrument:
+        instrument.print_report()
 
 
 # This is where the program starts when you run it
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,143 @@
+"""
+Metrics module for CPU Scheduling Algorithms
+Computes the summary numbers of a ScheduleResult in bulk:
+turnaround, normalized turnaround, waiting and response times,
+their percentiles, fairness, throughput and CPU utilization
+
+NumPy is used when it is installed, otherwise plain Python gives the same numbers
+"""
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+# Percentiles reported for every time metric
+PERCENTILES = (50, 95, 99)
+
+
+def first_start_times(result):
+    """When each process first got the CPU (-1 if it never ran)"""
+    first_start = []
+    for history in result.intervals:
+        start = -1
+        for interval_start, interval_end, state in history:
+            if state == '*':
+                start = interval_start
+                break
+        first_start.append(start)
+    return first_start
+
+
+def busy_time(result):
+    """How many time units the CPU spent running processes"""
+    return sum(end - start
+               for history in result.intervals
+               for start, end, state in history
+               if state == '*')
+
+
+def blocked_times(result):
+    """How long each process was blocked on I/O"""
+    return [sum(end - start for start, end, state in history if state == 'B')
+            for history in result.intervals]
+
+
+def percentile(sorted_values, percent):
+    """Percentile of an already sorted list, with linear interpolation (like NumPy's default)"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+def jain_fairness(total, total_of_squares, count):
+    """
+    Jain's fairness index of values from their sum and sum of squares
+    1 when every value is the same, down to 1/count when one value is everything
+    """
+    if count == 0 or total_of_squares == 0:
+        return 1.0
+    return total * total / (count * total_of_squares)
+
+
+def _summarize_python(name, values, metrics):
+    """Mean and percentiles of one metric, in plain Python"""
+    values = sorted(values)
+    metrics[f"mean_{name}"] = sum(values) / len(values) if values else 0.0
+    for percent in PERCENTILES:
+        metrics[f"p{percent}_{name}"] = percentile(values, percent)
+
+
+def _summarize_numpy(name, values, metrics):
+    """Mean and percentiles of one metric, with NumPy"""
+    if len(values) == 0:
+        metrics[f"mean_{name}"] = 0.0
+        for percent in PERCENTILES:
+            metrics[f"p{percent}_{name}"] = 0.0
+        return
+    metrics[f"mean_{name}"] = float(values.mean())
+    for percent, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        metrics[f"p{percent}_{name}"] = float(value)
+
+
+def compute_metrics(workload, result):
+    """
+    Summary metrics of one schedule, as a dictionary
+    Only processes that finished are counted in the time metrics
+    Time blocked on I/O is not counted as waiting
+    """
+    arrival = [process.arrival_time for process in workload.processes]
+    service = [process.service_time for process in workload.processes]
+    finish = result.finish_time
+    first_start = first_start_times(result)
+    # Turnaround is running + blocked + waiting, so waiting is what is left after these two
+    not_waiting = service
+    if workload.has_bursts:
+        not_waiting = [cpu + io for cpu, io in zip(service, blocked_times(result))]
+    metrics = {}
+
+    if np is not None:
+        arrival = np.asarray(arrival, dtype=np.int64)
+        service = np.asarray(service, dtype=np.int64)
+        finish = np.asarray(finish, dtype=np.int64)
+        first_start = np.asarray(first_start, dtype=np.int64)
+        not_waiting = np.asarray(not_waiting, dtype=np.int64)
+        done = finish > 0
+        arrival, service, finish, first_start = arrival[done], service[done], finish[done], first_start[done]
+        not_waiting = not_waiting[done]
+
+        turn_around = finish - arrival
+        _summarize_numpy("turnaround", turn_around, metrics)
+        norm_turn = turn_around / service
+        _summarize_numpy("norm_turn", norm_turn, metrics)
+        _summarize_numpy("waiting", turn_around - not_waiting, metrics)
+        _summarize_numpy("response", first_start - arrival, metrics)
+        completed = int(done.sum())
+        fairness = jain_fairness(float(norm_turn.sum()), float((norm_turn * norm_turn).sum()), completed)
+        start = int(arrival.min()) if completed else 0
+        end = int(finish.max()) if completed else 0
+    else:
+        done = [i for i in range(len(finish)) if finish[i] > 0]
+        turn_around = [finish[i] - arrival[i] for i in done]
+        _summarize_python("turnaround", turn_around, metrics)
+        norm_turn = [turn_around[k] / service[i] for k, i in enumerate(done)]
+        _summarize_python("norm_turn", norm_turn, metrics)
+        _summarize_python("waiting", [turn_around[k] - not_waiting[i] for k, i in enumerate(done)], metrics)
+        _summarize_python("response", [first_start[i] - arrival[i] for i in done], metrics)
+        completed = len(done)
+        fairness = jain_fairness(sum(norm_turn), sum(value * value for value in norm_turn), completed)
+        start = min(arrival[i] for i in done) if completed else 0
+        end = max(finish[i] for i in done) if completed else 0
+
+    # Throughput and utilization are measured from the first arrival to the last finish
+    span = end - start
+    metrics["completed"] = completed
+    # Did every process get slowed down by about the same factor?
+    metrics["fairness"] = fairness
+    metrics["throughput"] = completed / span if span > 0 else 0.0
+    metrics["cpu_utilization"] = min(1.0, busy_time(result) / span) if span > 0 else 0.0
+    return metrics
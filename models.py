@@ -0,0 +1,155 @@
+"""
+Data model for CPU Scheduling Algorithms
+A Workload holds the processes we want to schedule,
+a ScheduleResult holds what one algorithm did with them
+"""
+
+
+class Process:
+    """One process - its name, when it arrives, how long it runs and its priority"""
+
+    # __slots__ keeps each record small and makes attribute access fast
+    __slots__ = ("index", "name", "arrival_time", "service_time", "priority", "bursts")
+
+    def __init__(self, index, name, arrival_time, service_time, priority=1, bursts=None):
+        self.index = index  # Position of the process in the input
+        self.name = name
+        self.arrival_time = arrival_time
+        self.service_time = service_time  # Total CPU time, over all CPU bursts
+        self.priority = priority  # Lower number means higher priority
+        # (cpu, io, cpu, io, ..., cpu) burst lengths, or None for one CPU burst and no I/O
+        self.bursts = bursts
+
+    def cpu_bursts(self):
+        """The burst lengths - CPU bursts at even positions, I/O bursts between them"""
+        return self.bursts or (self.service_time,)
+
+    def __repr__(self):
+        return (f"Process({self.name!r}, arrival={self.arrival_time}, "
+                f"service={self.service_time}, priority={self.priority})")
+
+
+class Workload:
+    """All the processes of one simulation, plus how long the simulation runs"""
+
+    __slots__ = ("processes", "last_instant", "source", "arrival_sorted", "_process_to_index")
+
+    def __init__(self, processes, last_instant, source=None, arrival_sorted=False):
+        # List of Process records (or any sequence of them, like binary_format.ProcessColumns)
+        self.processes = processes
+        self.last_instant = last_instant  # How long to run the simulation
+        # Iterator of process chunks that have not been read yet (None if everything is loaded)
+        self.source = source
+        # True if processes are already in arrival order, so nobody needs to sort them
+        self.arrival_sorted = arrival_sorted
+        self._process_to_index = None
+
+    @classmethod
+    def stream(cls, chunks, last_instant):
+        """
+        A workload whose processes are read lazily, chunk by chunk
+        chunks gives lists of Process records, already in arrival order
+        """
+        return cls([], last_instant, iter(chunks), arrival_sorted=True)
+
+    @property
+    def process_to_index(self):
+        """Dictionary to find process by name (built the first time it is needed)"""
+        if self._process_to_index is None:
+            self._process_to_index = {process.name: process.index for process in self.processes}
+        return self._process_to_index
+
+    @property
+    def has_bursts(self):
+        """Does any process (loaded so far) do I/O between CPU bursts?"""
+        if not isinstance(self.processes, (list, tuple)):
+            return False  # Columns from binary_format have no bursts - don't build every Process to ask
+        return any(process.bursts for process in self.processes)
+
+    @property
+    def process_count(self):
+        """How many processes we have (so far, for a streamed workload)"""
+        return len(self.processes)
+
+    def freeze(self):
+        """
+        Read everything and make the process list read-only (a tuple), so any
+        number of algorithms can share this workload without changing it
+        """
+        while self.load_chunk():
+            pass
+        if isinstance(self.processes, list):
+            self.processes = tuple(self.processes)
+
+    def load_chunk(self):
+        """
+        Read the next chunk of a streamed workload into processes
+        Returns False once there is nothing more to read
+        """
+        if self.source is None:
+            return False
+        chunk = next(self.source, None)
+        if chunk is None:
+            self.source = None
+            return False
+        self.processes.extend(chunk)
+        if self._process_to_index is not None:
+            for process in chunk:
+                self._process_to_index[process.name] = process.index
+        return True
+
+
+class ScheduleResult:
+    """What one algorithm did with a workload"""
+
+    __slots__ = ("algorithm_id", "quantum", "finish_time", "turn_around_time",
+                 "norm_turn", "intervals", "core_stats")
+
+    def __init__(self, workload, algorithm_id="", quantum=-1, columns=None):
+        """
+        columns, if given, is (finish_time, turn_around_time, norm_turn, intervals)
+        already worked out elsewhere (like kernels.py) - they are used as they are
+        """
+        self.algorithm_id = algorithm_id  # Which algorithm produced this result
+        self.quantum = quantum  # Quantum used (Round Robin), -1 if none
+        if columns is not None:
+            self.finish_time, self.turn_around_time, self.norm_turn, self.intervals = columns
+        else:
+            # These arrays store the results for each process
+            self.finish_time = [0] * workload.process_count  # When each process finishes
+            self.turn_around_time = [0] * workload.process_count  # Total time from arrival to finish
+            self.norm_turn = [0.0] * workload.process_count  # Normalized turnaround time
+            # For each process, a list of (start, end, state) runs where state is
+            # '*' (running), '.' (waiting) or 'B' (blocked on I/O)
+            self.intervals = [[] for _ in range(workload.process_count)]
+        # Per-core numbers from smp.py (None for a single-CPU run)
+        self.core_stats = None
+
+    def grow(self, process_count):
+        """Make room for processes that were streamed in after this result was made"""
+        missing = process_count - len(self.finish_time)
+        if missing > 0:
+            self.finish_time.extend([0] * missing)
+            self.turn_around_time.extend([0] * missing)
+            self.norm_turn.extend([0.0] * missing)
+            self.intervals.extend([] for _ in range(missing))
+
+    def add_interval(self, process_index, start, end, state):
+        """
+        Record that a process was in a state ('*', '.' or 'B') from start to end
+        A run that continues the previous one with the same state is merged into it
+        """
+        if start >= end:
+            return
+        history = self.intervals[process_index]
+        if history and history[-1][1] == start and history[-1][2] == state:
+            history[-1] = (history[-1][0], end, state)
+        else:
+            history.append((start, end, state))
+
+    def finish(self, process, finish):
+        """Store finish, turnaround and normalized turnaround for a process"""
+        turn_around = finish - process.arrival_time
+        self.finish_time[process.index] = finish
+        self.turn_around_time[process.index] = turn_around
+        self.norm_turn[process.index] = turn_around / process.service_time
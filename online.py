@@ -0,0 +1,258 @@
+"""
+Online scheduler for CPU Scheduling Algorithms
+Schedules processes while they are still arriving, instead of needing the
+whole workload up front - so it can follow a live feed of jobs forever
+
+    scheduler = OnlineScheduler("6")
+    scheduler.submit(Process(0, "A", 0, 3))
+    for time, kind, process in scheduler.advance(10):
+        print(time, kind, process.name)      # kind is "dispatch", "preempt" or "complete"
+
+Only processes that have not finished are kept. A finished process is
+added to running totals (see summary) and then forgotten, so memory
+depends on how many processes are waiting, not on how many came before
+
+The decisions are the same as the batch algorithms in algorithms.py make
+"""
+
+import heapq
+from collections import deque
+
+from algorithms import arrival_key, service_key, priority_key, queue_level
+from ready_queue import HeapReadyQueue, IndexedHeapReadyQueue, MultiLevelReadyQueue
+
+# FCFS goes by (arrival_time, index), the same order as the batch algorithm
+NON_PREEMPTIVE_KEYS = {"1": arrival_key, "2": service_key, "3": priority_key, "5": service_key}
+PREEMPTIVE_KEYS = {
+    "6": lambda process, remaining_time: remaining_time,
+    "7": lambda process, remaining_time: process.priority,
+}
+
+# Time metrics kept as running totals
+TIME_METRICS = ("turnaround", "norm_turn", "waiting", "response")
+
+
+class OnlineScheduler:
+    """One algorithm scheduling processes as they are submitted"""
+
+    def __init__(self, algorithm_id="1", quantum=-1):
+        self.algorithm_id = algorithm_id
+        self.quantum = quantum
+        self.now = 0  # Everything before now has been simulated
+        self.upcoming = []  # Heap of (arrival_time, index, process) submitted for the future
+        self.active = {}  # Processes that have arrived and not finished, by index
+        self.remaining = {}  # Time each active process still needs (as of its last run)
+        self.first_start = {}  # When each active process first got the CPU
+        self.running = None  # Index of the process on the CPU
+        self.run_start = 0  # When the running process got the CPU this time
+        self.slice_end = 0  # When it gives the CPU up again (finishes, or its quantum expires)
+        self.pending_events = deque()
+
+        if algorithm_id == "4":
+            if quantum <= 0:
+                raise ValueError("Round Robin needs a positive quantum")
+            self.ready_queue = deque()
+        elif algorithm_id == "5":
+            self.ready_queue = MultiLevelReadyQueue(
+                3, lambda process_index: queue_level(self.active[process_index].priority))
+        elif algorithm_id in NON_PREEMPTIVE_KEYS:
+            self.ready_queue = HeapReadyQueue()
+        elif algorithm_id in PREEMPTIVE_KEYS:
+            # Like engine.run_preemptive, the running process stays in the heap
+            self.ready_queue = IndexedHeapReadyQueue()
+        else:
+            raise ValueError(f"Algorithm {algorithm_id} can't run online")
+
+        # Running totals of everything that has finished
+        self.completed = 0
+        self.totals = dict.fromkeys(TIME_METRICS, 0)
+        self.maximums = dict.fromkeys(TIME_METRICS, 0)
+        self.busy_time = 0
+        self.first_arrival = None
+        self.last_finish = 0
+
+    def submit(self, process):
+        """
+        Add a process that arrives now or later
+        Its index must not be used by another unfinished process
+        """
+        if process.arrival_time < self.now:
+            raise ValueError(f"Process {process.name} arrives at {process.arrival_time}, "
+                             f"but the scheduler is already at {self.now}")
+        if process.service_time <= 0:
+            raise ValueError(f"Process {process.name} needs a positive service time")
+        if process.bursts:
+            raise ValueError(f"Process {process.name} does I/O, which the online scheduler can't run")
+        heapq.heappush(self.upcoming, (process.arrival_time, process.index, process))
+        if self.first_arrival is None or process.arrival_time < self.first_arrival:
+            self.first_arrival = process.arrival_time
+
+    def advance(self, to_time=None):
+        """
+        Simulate up to to_time (or until the CPU runs out of work if it is None)
+        and return an iterator of the events that happened
+        Decisions at to_time itself wait for the next call, so processes arriving
+        at to_time can still be submitted
+        """
+        while True:
+            event_time = self.next_event_time()
+            if event_time is None or (to_time is not None and event_time >= to_time):
+                break
+            self.handle(event_time)
+        if to_time is not None and to_time > self.now:
+            self.now = to_time
+        return self.events()
+
+    def events(self):
+        """Iterator of (time, kind, process) events that have not been handed out yet"""
+        while self.pending_events:
+            yield self.pending_events.popleft()
+
+    def next_event_time(self):
+        """When the next process arrives or the running one stops, None if nothing will happen"""
+        times = []
+        if self.upcoming:
+            times.append(self.upcoming[0][0])
+        if self.running is not None:
+            times.append(self.slice_end)
+        return min(times) if times else None
+
+    def handle(self, time):
+        """Everything that happens at time - in the same order the batch algorithms use"""
+        self.now = time
+        if self.algorithm_id == "4":
+            self.handle_round_robin(time)
+        elif self.algorithm_id in PREEMPTIVE_KEYS:
+            self.handle_preemptive(time)
+        else:
+            self.handle_non_preemptive(time)
+
+    def admit(self, time):
+        """Move every process that has arrived by time into the active set, and return them"""
+        arrived = []
+        while self.upcoming and self.upcoming[0][0] <= time:
+            process = heapq.heappop(self.upcoming)[2]
+            self.active[process.index] = process
+            self.remaining[process.index] = process.service_time
+            arrived.append(process)
+        return arrived
+
+    def handle_non_preemptive(self, time):
+        """Finish the running process, queue the newcomers, then pick the next one"""
+        if self.running is not None and self.slice_end == time:
+            self.stop(time)
+        sort_key = NON_PREEMPTIVE_KEYS[self.algorithm_id]
+        for process in self.admit(time):
+            self.ready_queue.push(process.index, sort_key(process))
+        if self.running is None and self.ready_queue:
+            process_index = self.ready_queue.pop()
+            self.dispatch(process_index, time, time + self.remaining[process_index])
+
+    def handle_round_robin(self, time):
+        """Newcomers go in line before the process whose quantum just expired"""
+        for process in self.admit(time):
+            self.ready_queue.append(process.index)
+        if self.running is not None and self.slice_end == time:
+            process_index = self.running
+            if self.remaining[process_index] - (time - self.run_start) > 0 and not self.ready_queue:
+                # Alone on the CPU, so it simply gets another quantum
+                self.slice_end = time + min(self.quantum, self.remaining[process_index] - (time - self.run_start))
+                return
+            if self.stop(time):
+                self.ready_queue.append(process_index)
+        if self.running is None and self.ready_queue:
+            process_index = self.ready_queue.popleft()
+            self.dispatch(process_index, time, time + min(self.quantum, self.remaining[process_index]))
+
+    def handle_preemptive(self, time):
+        """Re-decide whenever a process finishes or arrives - a better newcomer takes the CPU"""
+        key_of = PREEMPTIVE_KEYS[self.algorithm_id]
+        if self.running is not None and self.slice_end == time:
+            self.ready_queue.pop()  # The finished process is on top of the heap
+            self.stop(time)
+        arrived = self.admit(time)
+        if self.running is not None and arrived:
+            # Bring the running process's key up to date before comparing
+            running = self.running
+            remaining = self.remaining[running] - (time - self.run_start)
+            self.ready_queue.update(running, key_of(self.active[running], remaining))
+        for process in arrived:
+            self.ready_queue.push(process.index, key_of(process, process.service_time))
+        if self.ready_queue and self.ready_queue.peek() != self.running:
+            if self.running is not None:
+                self.stop(time)
+            process_index = self.ready_queue.peek()
+            self.dispatch(process_index, time, time + self.remaining[process_index])
+
+    def dispatch(self, process_index, time, slice_end):
+        """Give the CPU to a process until slice_end"""
+        self.running = process_index
+        self.run_start = time
+        self.slice_end = slice_end
+        self.first_start.setdefault(process_index, time)
+        self.pending_events.append((time, "dispatch", self.active[process_index]))
+
+    def stop(self, time):
+        """
+        Take the CPU away from the running process at time
+        Returns True if it still needs more time, False if it finished
+        """
+        process_index = self.running
+        ran = time - self.run_start
+        self.busy_time += ran
+        self.remaining[process_index] -= ran
+        self.running = None
+        if self.remaining[process_index] > 0:
+            self.pending_events.append((time, "preempt", self.active[process_index]))
+            return True
+        self.retire(process_index, time)
+        return False
+
+    def retire(self, process_index, time):
+        """Add a finished process to the running totals and forget it"""
+        process = self.active.pop(process_index)
+        first_start = self.first_start.pop(process_index)
+        del self.remaining[process_index]
+
+        turn_around = time - process.arrival_time
+        values = {
+            "turnaround": turn_around,
+            "norm_turn": turn_around / process.service_time,
+            "waiting": turn_around - process.service_time,
+            "response": first_start - process.arrival_time,
+        }
+        for name, value in values.items():
+            self.totals[name] += value
+            if value > self.maximums[name]:
+                self.maximums[name] = value
+        self.completed += 1
+        self.last_finish = time
+        self.pending_events.append((time, "complete", process))
+
+    def summary(self):
+        """Running metrics of every process finished so far, named like metrics.compute_metrics"""
+        metrics = {}
+        for name in TIME_METRICS:
+            metrics[f"mean_{name}"] = self.totals[name] / self.completed if self.completed else 0.0
+            metrics[f"max_{name}"] = self.maximums[name]
+        span = self.now - self.first_arrival if self.first_arrival is not None else 0
+        busy = self.busy_time
+        if self.running is not None and self.now > self.run_start:
+            busy += self.now - self.run_start  # Count the run in progress too
+        metrics["completed"] = self.completed
+        metrics["active"] = len(self.active)
+        metrics["throughput"] = self.completed / span if span > 0 else 0.0
+        metrics["cpu_utilization"] = min(1.0, busy / span) if span > 0 else 0.0
+        return metrics
+
+
+def replay(processes, algorithm_id="1", quantum=-1, until=None):
+    """
+    Feed processes (any iterable in arrival order, even an endless one) through
+    an OnlineScheduler and yield (time, kind, process) events as they happen
+    """
+    scheduler = OnlineScheduler(algorithm_id, quantum)
+    for process in processes:
+        yield from scheduler.advance(process.arrival_time)
+        scheduler.submit(process)
+    yield from scheduler.advance(until)
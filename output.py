@@ -1,130 +1,200 @@
 """
 Output module for CPU Scheduling Algorithms
 Handles printing statistics and timeline
+
+Rows are built as whole strings and written in big chunks,
+to sys.stdout by default or to any file-like object passed as out
 """
 
-import parser
+import io
+import sys
+
+from metrics import blocked_times
 
 # Algorithm names for display
-ALGORITHMS = ["", "FCFS", "SJN", "Priority", "RR", "Multi-Level"]
+ALGORITHMS = ["", "FCFS", "SJN", "Priority", "RR", "Multi-Level", "SRTF", "Preemptive-Priority", "MLFQ",
+              "Lottery", "Stride"]
+
+# Algorithms that run in time slices - their label shows the quantum, like 'RR-2'
+QUANTUM_ALGORITHMS = (4, 8, 9, 10)
+
+# Write the timeline out whenever this many characters have piled up
+BUFFER_SIZE = 1 << 16
+
+
+def algorithm_label(algorithm_id, quantum):
+    """Algorithm name with parameters if applicable, like 'SJN' or 'RR-2'"""
+    algorithm_id = int(algorithm_id)
+    if not 0 < algorithm_id < len(ALGORITHMS):
+        raise ValueError(f"Unknown algorithm: {algorithm_id}")
+
+    if algorithm_id in QUANTUM_ALGORITHMS:
+        return f"{ALGORITHMS[algorithm_id]}-{quantum}"
+    return ALGORITHMS[algorithm_id]
+
+
+def format_mean(mean):
+    """Format a mean so it always takes 5 characters (up to 99.99)"""
+    if mean >= 10:
+        return f"{mean:.2f}"
+    return f" {mean:.2f}"
+
+
+def format_processes(workload):
+    """Process names header row"""
+    cells = "".join([f"|  {process.name}  " for process in workload.processes])
+    return f"Process    {cells}|\n"
+
+
+def format_arrival_time(workload):
+    """Arrival times row"""
+    cells = "".join([f"|{process.arrival_time:3d}  " for process in workload.processes])
+    return f"Arrival    {cells}|\n"
+
+
+def format_service_time(workload):
+    """Service times row with mean"""
+    service_times = [process.service_time for process in workload.processes]
+    cells = "".join([f"{service_time:3d}  |" for service_time in service_times])
+    mean_service = sum(service_times) / workload.process_count
+    return f"Service    |{cells} {mean_service:.1f}|\n"
+
+
+def format_priority(workload):
+    """Priority levels row"""
+    cells = "".join([f"{process.priority:3d}  |" for process in workload.processes])
+    return f"Priority   |{cells}|\n"
+
+
+def format_finish_time(result):
+    """Finish times row"""
+    cells = "".join([f"|{finish_time:3d}  " for finish_time in result.finish_time])
+    return f"Finish     {cells}|-----|\n"
+
+
+def format_turn_around_time(result):
+    """Turnaround times row with mean"""
+    cells = "".join([f"{turn_around_time:3d}  |" for turn_around_time in result.turn_around_time])
+    mean_turnaround = sum(result.turn_around_time) / len(result.turn_around_time)
+    return f"Turnaround |{cells}{format_mean(mean_turnaround)}|\n"
+
+
+def format_norm_turn(result):
+    """Normalized turnaround times row with mean"""
+    cells = "".join([f"{format_mean(norm_turn)}|" for norm_turn in result.norm_turn])
+    mean_norm_turn = sum(result.norm_turn) / len(result.norm_turn)
+    return f"NormTurn   |{cells}{format_mean(mean_norm_turn)}|\n"
+
+
+def format_blocked_time(result):
+    """Time blocked on I/O row with mean"""
+    blocked = blocked_times(result)
+    cells = "".join([f"{blocked_time:3d}  |" for blocked_time in blocked])
+    mean_blocked = sum(blocked) / len(blocked)
+    return f"Blocked    |{cells}{format_mean(mean_blocked)}|\n"
 
 
-def print_algorithm(algorithm_index):
+def print_algorithm(result, out=None):
     """Print algorithm name with parameters if applicable"""
-    algorithm_id = int(parser.algorithms[algorithm_index][0])
-    quantum = parser.algorithms[algorithm_index][1]
-    
-    if algorithm_id == 4:  # Round Robin
-        print(f"RR-{quantum}")
-    else:
-        print(ALGORITHMS[algorithm_id])
-
-
-def print_processes():
-    """Print process names header"""
-    print("Process    ", end="")
-    for i in range(parser.process_count):
-        print(f"|  {parser.get_process_name(parser.processes[i])}  ", end="")
-    print("|")
-
-
-def print_arrival_time():
-    """Print arrival times"""
-    print("Arrival    ", end="")
-    for i in range(parser.process_count):
-        print(f"|{parser.get_arrival_time(parser.processes[i]):3d}  ", end="")
-    print("|")
-
-
-def print_service_time():
-    """Print service times with mean"""
-    print("Service    |", end="")
-    sum_service = 0
-    for i in range(parser.process_count):
-        service_time = parser.get_service_time(parser.processes[i])
-        print(f"{service_time:3d}  |", end="")
-        sum_service += service_time
-    
-    mean_service = sum_service / parser.process_count
-    print(f" {mean_service:.1f}|")
-
-
-def print_priority():
-    """Print priority levels"""
-    print("Priority   |", end="")
-    for i in range(parser.process_count):
-        priority = parser.get_priority(parser.processes[i])
-        print(f"{priority:3d}  |", end="")
-    print("|")
-
-
-def print_finish_time():
-    """Print finish times"""
-    print("Finish     ", end="")
-    for i in range(parser.process_count):
-        print(f"|{parser.finish_time[i]:3d}  ", end="")
-    print("|-----|")
-
-
-def print_turn_around_time():
-    """Print turnaround times with mean"""
-    print("Turnaround |", end="")
-    sum_turnaround = 0
-    for i in range(parser.process_count):
-        print(f"{parser.turn_around_time[i]:3d}  |", end="")
-        sum_turnaround += parser.turn_around_time[i]
-    
-    mean_turnaround = sum_turnaround / len(parser.turn_around_time)
-    if mean_turnaround >= 10:
-        print(f"{mean_turnaround:.2f}|")
-    else:
-        print(f" {mean_turnaround:.2f}|")
-
-
-def print_norm_turn():
-    """Print normalized turnaround times with mean"""
-    print("NormTurn   |", end="")
-    sum_norm_turn = 0
-    for i in range(parser.process_count):
-        if parser.norm_turn[i] >= 10:
-            print(f"{parser.norm_turn[i]:.2f}|", end="")
-        else:
-            print(f" {parser.norm_turn[i]:.2f}|", end="")
-        sum_norm_turn += parser.norm_turn[i]
-    
-    mean_norm_turn = sum_norm_turn / len(parser.norm_turn)
-    if mean_norm_turn >= 10:
-        print(f"{mean_norm_turn:.2f}|")
-    else:
-        print(f" {mean_norm_turn:.2f}|")
-
-
-def print_stats(algorithm_index):
-    """Print complete statistics for an algorithm"""
-    print_algorithm(algorithm_index)
-    print_processes()
-    print_arrival_time()
-    print_service_time()
-    print_priority()
-    print_finish_time()
-    print_turn_around_time()
-    print_norm_turn()
-
-
-def print_timeline(algorithm_index):
+    if out is None:
+        out = sys.stdout
+    out.write(algorithm_label(result.algorithm_id, result.quantum) + "\n")
+
+
+def print_stats(workload, result, out=None):
+    """Print complete statistics for an algorithm (and time blocked on I/O, if processes do I/O)"""
+    if out is None:
+        out = sys.stdout
+    rows = [
+        algorithm_label(result.algorithm_id, result.quantum) + "\n",
+        format_processes(workload),
+        format_arrival_time(workload),
+        format_service_time(workload),
+        format_priority(workload),
+        format_finish_time(result),
+        format_turn_around_time(result),
+        format_norm_turn(result),
+    ]
+    if workload.has_bursts:
+        rows.append(format_blocked_time(result))
+    out.write("".join(rows))
+
+
+def print_metrics(result, metrics, out=None):
+    """Print the summary metrics from metrics.compute_metrics for an algorithm"""
+    if out is None:
+        out = sys.stdout
+    rows = [
+        algorithm_label(result.algorithm_id, result.quantum) + "\n",
+        f"{'Metric':<11}|{'Mean':>9} |{'p50':>9} |{'p95':>9} |{'p99':>9} |\n",
+    ]
+    for name, title in (("turnaround", "Turnaround"), ("norm_turn", "NormTurn"),
+                        ("waiting", "Waiting"), ("response", "Response")):
+        rows.append(f"{title:<11}|{metrics['mean_' + name]:9.2f} |{metrics['p50_' + name]:9.2f} |"
+                    f"{metrics['p95_' + name]:9.2f} |{metrics['p99_' + name]:9.2f} |\n")
+    rows.append(f"Completed  |{metrics['completed']:9d} |\n")
+    rows.append(f"Throughput |{metrics['throughput']:9.4f} |\n")
+    rows.append(f"CPU Usage  |{metrics['cpu_utilization'] * 100:8.1f}% |\n")
+    out.write("".join(rows))
+
+
+def print_comparison(rows, out=None):
+    """
+    Print one ranked table of several algorithms run on the same workload
+    rows is a list of (label, metrics) - the lowest mean turnaround ranks first
+    """
+    if out is None:
+        out = sys.stdout
+    ranked = sorted(rows, key=lambda row: (row[1]["mean_turnaround"], row[1]["p99_turnaround"]))
+    lines = [f"{'Rank':<5}|{'Algorithm':<20}|{'Turnaround':>11} |{'p99':>9} |"
+             f"{'Waiting':>9} |{'p99':>9} |{'Fairness':>9} |\n"]
+    for rank, (label, metrics) in enumerate(ranked, 1):
+        lines.append(f"{rank:<5}|{label:<20}|{metrics['mean_turnaround']:11.2f} |{metrics['p99_turnaround']:9.2f} |"
+                     f"{metrics['mean_waiting']:9.2f} |{metrics['p99_waiting']:9.2f} |{metrics['fairness']:9.3f} |\n")
+    out.write("".join(lines))
+
+
+def print_core_stats(core_stats, out=None):
+    """Print per-core utilization and load imbalance of a multi-CPU run"""
+    if out is None:
+        out = sys.stdout
+    rows = [f"Core {core:<5} | busy {busy:6d} | {utilization * 100:5.1f}%\n"
+            for core, (busy, utilization)
+            in enumerate(zip(core_stats["busy_time"], core_stats["utilization"]))]
+    rows.append(f"Imbalance  | {core_stats['imbalance']:.2f}\n")
+    rows.append(f"Migrations | {core_stats['migrations']}\n")
+    out.write("".join(rows))
+
+
+def format_timeline_row(process, intervals, last_instant):
+    """One process's timeline row, drawn from its intervals"""
+    row = [' '] * last_instant
+    for start, end, state in intervals:
+        end = min(end, last_instant)
+        if start < end:
+            row[start:end] = state * (end - start)
+    cells = "|".join(row) + "|" if row else ""
+    return f"{process.name}     |{cells}\n"
+
+
+def print_timeline(workload, result, out=None):
     """Print timeline for an algorithm"""
-    # Print time header
-    for i in range(parser.last_instant + 1):
-        print(f"{i % 10} ", end="")
-    print()
-    
-    print("-" * 48)
-    
-    # Print process timelines
-    for i in range(parser.process_count):
-        print(f"{parser.get_process_name(parser.processes[i])}     |", end="")
-        for j in range(parser.last_instant):
-            print(f"{parser.timeline[j][i]}|", end="")
-        print()
-    
-    print("-" * 48) 
\ No newline at end of file
+    if out is None:
+        out = sys.stdout
+    last_instant = workload.last_instant
+    buffer = io.StringIO()
+
+    # Print time header - the digits 0-9 repeat, so cut a long repeat to size
+    header_length = 2 * (last_instant + 1)
+    buffer.write(("0 1 2 3 4 5 6 7 8 9 " * (header_length // 20 + 1))[:header_length] + "\n")
+    buffer.write("-" * 48 + "\n")
+
+    # Print process timelines, handing the text over in big chunks
+    for process in workload.processes:
+        buffer.write(format_timeline_row(process, result.intervals[process.index], last_instant))
+        if buffer.tell() >= BUFFER_SIZE:
+            out.write(buffer.getvalue())
+            buffer = io.StringIO()
+
+    buffer.write("-" * 48 + "\n")
+    out.write(buffer.getvalue())
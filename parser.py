@@ -1,29 +1,20 @@
 """
 Parser module for CPU Scheduling Algorithms
-This file reads the input and stores all the data we need
+This file reads the input and turns it into a Workload
 """
 
-# These are the variables that store all our data
-# Think of them as boxes where we keep our information
-operation = ""  # Will be "trace" or "stats"
-last_instant = 0  # How long to run the simulation
-process_count = 0  # How many processes we have
-algorithms = []  # List of which algorithms to run
-processes = []  # List of all our processes
-timeline = []  # 2D array to show what happens at each time
-process_to_index = {}  # Dictionary to find process by name
+import sys
 
-# These arrays store the results for each process
-finish_time = []  # When each process finishes
-turn_around_time = []  # Total time from arrival to finish
-norm_turn = []  # Normalized turnaround time
+from models import Process, Workload
+
+# How many bytes of input to read at once when streaming processes
+CHUNK_BYTES = 1 << 20
 
 
 def parse_algorithms(algorithm_chunk):
     """Read the algorithm string and figure out which algorithms to run"""
-    global algorithms
     algorithms = []  # Start with empty list
-    
+
     # Split by comma if there are multiple algorithms
     for alg in algorithm_chunk.split(','):
         if '-' in alg:
@@ -35,89 +26,109 @@ def parse_algorithms(algorithm_chunk):
             # This is an algorithm without a number
             algorithm_id = alg
             quantum = -1
-        
+
         # Add this algorithm to our list
         algorithms.append((algorithm_id, quantum))
 
-
-def parse_processes():
-    """Read all the process information from input"""
-    global processes, process_to_index
-    
-    processes = []  # Start with empty list
-    process_to_index = {}  # Start with empty dictionary
-    
-    for i in range(process_count):
-        # Read one line of process data
-        process_chunk = input().strip()
-        parts = process_chunk.split(',')
-        
-        # Extract the information from the line
-        # Format: name,arrival_time,service_time,priority
-        process_name = parts[0]
-        process_arrival_time = int(parts[1])
-        process_service_time = int(parts[2])
-        process_priority = int(parts[3]) if len(parts) > 3 else 1
-        
-        # Store this process
-        processes.append((process_name, process_arrival_time, process_service_time, process_priority))
-        process_to_index[process_name] = i  # Remember which number this process is
-
-
-def parse():
-    """Main function that reads all the input and sets up everything"""
-    global operation, last_instant, process_count, finish_time, turn_around_time, norm_turn, timeline
-    
-    # Read the first 4 lines of input
-    operation = input().strip()  # "trace" or "stats"
-    algorithm_chunk = input().strip()  # Which algorithms to run
-    last_instant = int(input().strip())  # How long to run
-    process_count = int(input().strip())  # How many processes
-    
-    # Parse the algorithms and processes
-    parse_algorithms(algorithm_chunk)
-    parse_processes()
-    
-    # Set up the result arrays - one slot for each process
-    finish_time = [0] * process_count
-    turn_around_time = [0] * process_count
-    norm_turn = [0.0] * process_count
-    
-    # Set up the timeline - this is a 2D array like a grid
-    # timeline[time][process] shows what process is doing at that time
-    timeline = [[' ' for _ in range(process_count)] for _ in range(last_instant)]
+    return algorithms
 
 
-def get_process_name(process):
-    """Get the name of a process"""
-    return process[0]
+def parse_process(index, process_chunk):
+    """
+    Turn one line like 'A,0,3,1' into a Process
+    More numbers after the priority are I/O and CPU bursts that follow the first
+    CPU burst: 'A,0,3,1,2,4' runs 3, waits 2 for I/O, then runs 4 more
+    """
+    parts = process_chunk.strip().split(',')
 
+    # Extract the information from the line
+    # Format: name,arrival_time,service_time,priority[,io,cpu,io,cpu...]
+    process_name = parts[0]
+    process_arrival_time = int(parts[1])
+    process_service_time = int(parts[2])
+    process_priority = int(parts[3]) if len(parts) > 3 else 1
 
-def get_arrival_time(process):
-    """Get when a process arrives"""
-    return process[1]
+    bursts = None
+    if len(parts) > 4:
+        if len(parts) % 2:
+            raise ValueError(f"Process {process_name} needs a CPU burst after every I/O burst")
+        bursts = (process_service_time,) + tuple(int(part) for part in parts[4:])
+        process_service_time = sum(bursts[0::2])
 
+    return Process(index, process_name, process_arrival_time, process_service_time, process_priority, bursts)
 
-def get_service_time(process):
-    """Get how long a process needs to run"""
-    return process[2]
-
-
-def get_priority(process):
-    """Get the priority of a process"""
-    return process[3]
 
+def parse_processes(process_count, read_line):
+    """Read all the process information from input"""
+    processes = []  # Start with empty list
 
-def clear_timeline():
-    """Clear the timeline - fill it with spaces"""
-    global timeline
-    timeline = [[' ' for _ in range(process_count)] for _ in range(last_instant)]
+    for i in range(process_count):
+        # Read one line of process data
+        processes.append(parse_process(i, read_line()))
+
+    return processes
+
+
+def iter_process_chunks(input_file, first_index=0, chunk_bytes=CHUNK_BYTES):
+    """
+    Read process lines lazily, a big block of lines at a time
+    Yields lists of Process records and checks that arrivals never go backwards
+    """
+    index = first_index
+    last_arrival = None
+    while True:
+        lines = input_file.readlines(chunk_bytes)
+        if not lines:
+            return
+        chunk = []
+        for line in lines:
+            if not line.strip():
+                continue  # Skip empty lines
+            process = parse_process(index, line)
+            if last_arrival is not None and process.arrival_time < last_arrival:
+                raise ValueError(f"Process {process.name} arrives at {process.arrival_time}, "
+                                 f"before the previous process - input must be in arrival order")
+            last_arrival = process.arrival_time
+            chunk.append(process)
+            index += 1
+        if chunk:
+            yield chunk
+
+
+def parse(input_file=None):
+    """
+    Main function that reads all the input
+    input_file is where we read from - by default it is the keyboard/stdin
+    Returns (operation, algorithms, workload)
+
+    If the process count line is '-', the processes are not counted up front:
+    they are streamed in as the scheduler needs them, until the end of the input
+    """
+    if input_file is None:
+        input_file = sys.stdin
+    read_line = input_file.readline
 
+    # Read the first 4 lines of input
+    operation = read_line().strip()  # "trace" or "stats"
+    algorithm_chunk = read_line().strip()  # Which algorithms to run
+    last_instant = int(read_line().strip())  # How long to run
+    process_count_chunk = read_line().strip()  # How many processes (or '-')
 
-def fill_in_wait_time():
-    """Fill in the wait times in the timeline with dots"""
-    for i in range(process_count):
-        arrival_time = get_arrival_time(processes[i])
-        for k in range(arrival_time, finish_time[i]):
-            if timeline[k][i] != '*':  # If not executing, then waiting
-                timeline[k][i] = '.' 
\ No newline at end of file
+    # Parse the algorithms and processes
+    algorithms = parse_algorithms(algorithm_chunk)
+    if process_count_chunk == '-':
+        workload = Workload.stream(iter_process_chunks(input_file), last_instant)
+    else:
+        workload = Workload(parse_processes(int(process_count_chunk), read_line), last_instant)
+
+    return operation, algorithms, workload
+
+
+def parse_file(path):
+    """Read the same input as parse(), but from a file"""
+    input_file = open(path)
+    operation, algorithms, workload = parse(input_file)
+    if workload.source is None:
+        # Everything is loaded - a streamed workload keeps reading the file later
+        input_file.close()
+    return operation, algorithms, workload
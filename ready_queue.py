@@ -0,0 +1,226 @@
+"""
+Ready queues for CPU Scheduling Algorithms
+A ready queue holds the processes that have arrived and are waiting for the CPU
+Every queue here has the same three operations: push, pop and len,
+plus snapshot and restore so incremental.py can checkpoint them
+"""
+
+import heapq
+
+
+class HeapReadyQueue:
+    """
+    Ready queue backed by a binary heap
+    pop() always gives back the process with the smallest key
+    Processes with the same key come out in the order they arrived
+    """
+
+    def __init__(self):
+        self.heap = []
+        # Count the pushes - processes are pushed once, when they arrive,
+        # so this number is their position in the arrival order
+        self.pushed = 0
+
+    def push(self, process_index, key):
+        """Add a process to the queue - O(log n)"""
+        heapq.heappush(self.heap, (key, self.pushed, process_index))
+        self.pushed += 1
+
+    def peek(self):
+        """The process with the smallest key, without removing it"""
+        return self.heap[0][2]
+
+    def pop(self):
+        """Remove and return the process with the smallest key - O(log n)"""
+        return heapq.heappop(self.heap)[2]
+
+    def __len__(self):
+        return len(self.heap)
+
+    def snapshot(self):
+        """Copy of everything in the queue - O(n)"""
+        return list(self.heap), self.pushed
+
+    def restore(self, state):
+        """Go back to a snapshot (the snapshot itself is left untouched)"""
+        heap, self.pushed = state
+        self.heap = list(heap)
+
+
+class MultiLevelReadyQueue:
+    """
+    Several heap queues stacked on top of each other
+    pop() always looks at the highest level (level 0) first
+    """
+
+    def __init__(self, level_count, level_of):
+        # level_of(process_index) tells us which level a process belongs to
+        self.levels = [HeapReadyQueue() for _ in range(level_count)]
+        self.level_of = level_of
+        self.size = 0
+
+    def push(self, process_index, key):
+        """Add a process to its own level"""
+        self.levels[self.level_of(process_index)].push(process_index, key)
+        self.size += 1
+
+    def pop(self):
+        """Remove and return the best process from the highest non-empty level"""
+        for level in self.levels:
+            if level:
+                self.size -= 1
+                return level.pop()
+        raise IndexError("pop from an empty ready queue")
+
+    def __len__(self):
+        return self.size
+
+    def snapshot(self):
+        """Copy of every level"""
+        return [level.snapshot() for level in self.levels], self.size
+
+    def restore(self, state):
+        """Go back to a snapshot (the snapshot itself is left untouched)"""
+        levels, self.size = state
+        for level, level_state in zip(self.levels, levels):
+            level.restore(level_state)
+
+
+class IndexedHeapReadyQueue:
+    """
+    Binary heap that also remembers where each process sits inside it
+    That lets us change the key of a queued process (decrease-key) in O(log n)
+    Processes with the same key come out in the order they arrived
+    """
+
+    def __init__(self):
+        self.heap = []  # Entries are [key, arrival_index, process_index]
+        self.position = {}  # process_index -> where its entry is in the heap
+        self.pushed = 0  # Processes are pushed once, when they arrive
+
+    def push(self, process_index, key):
+        """Add a process to the queue - O(log n)"""
+        self.heap.append([key, self.pushed, process_index])
+        self.pushed += 1
+        self.position[process_index] = len(self.heap) - 1
+        self._sift_up(len(self.heap) - 1)
+
+    def peek(self):
+        """The process with the smallest key, without removing it"""
+        return self.heap[0][2]
+
+    def pop(self):
+        """Remove and return the process with the smallest key - O(log n)"""
+        top = self.heap[0]
+        last = self.heap.pop()
+        del self.position[top[2]]
+        if self.heap:
+            self.heap[0] = last
+            self.position[last[2]] = 0
+            self._sift_down(0)
+        return top[2]
+
+    def update(self, process_index, key):
+        """Change the key of a process that is already queued - O(log n)"""
+        i = self.position[process_index]
+        old_key = self.heap[i][0]
+        self.heap[i][0] = key
+        if key < old_key:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def __contains__(self, process_index):
+        return process_index in self.position
+
+    def __len__(self):
+        return len(self.heap)
+
+    def snapshot(self):
+        """Copy of everything in the queue - O(n)"""
+        return [list(entry) for entry in self.heap], self.pushed
+
+    def restore(self, state):
+        """Go back to a snapshot (the snapshot itself is left untouched)"""
+        heap, self.pushed = state
+        self.heap = [list(entry) for entry in heap]
+        self.position = {entry[2]: i for i, entry in enumerate(self.heap)}
+
+    def _swap(self, i, j):
+        """Swap two heap entries and keep the positions up to date"""
+        heap = self.heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self.position[heap[i][2]] = i
+        self.position[heap[j][2]] = j
+
+    def _sift_up(self, i):
+        """Move an entry up while it is smaller than its parent"""
+        heap = self.heap
+        while i > 0:
+            parent = (i - 1) // 2
+            if heap[i][:2] < heap[parent][:2]:
+                self._swap(i, parent)
+                i = parent
+            else:
+                break
+
+    def _sift_down(self, i):
+        """Move an entry down while one of its children is smaller"""
+        heap = self.heap
+        size = len(heap)
+        while True:
+            smallest = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < size and heap[child][:2] < heap[smallest][:2]:
+                    smallest = child
+            if smallest == i:
+                break
+            self._swap(i, smallest)
+            i = smallest
+
+
+class TicketTree:
+    """
+    Fenwick tree (binary indexed tree) of lottery tickets, one slot per process
+    Adding tickets and finding who holds ticket number t are both O(log n),
+    so a lottery draw doesn't have to walk over every ready process
+    """
+
+    def __init__(self, size=16):
+        self.size = size
+        self.tree = [0] * (size + 1)  # 1-based partial sums
+        self.tickets = [0] * size  # Tickets in each slot, to rebuild the tree when it grows
+        self.total = 0
+
+    def add(self, slot, tickets):
+        """Give slot more tickets (or take them away with a negative number) - O(log n)"""
+        if slot >= self.size:
+            self._grow(slot + 1)
+        self.tickets[slot] += tickets
+        self.total += tickets
+        i = slot + 1
+        while i <= self.size:
+            self.tree[i] += tickets
+            i += i & -i
+
+    def find(self, ticket):
+        """The slot holding ticket number ticket (0 <= ticket < total) - O(log n)"""
+        position = 0
+        step = 1 << (self.size.bit_length() - 1)
+        while step:
+            if position + step <= self.size and self.tree[position + step] <= ticket:
+                position += step
+                ticket -= self.tree[position]
+            step >>= 1
+        return position
+
+    def _grow(self, needed):
+        """Make room for at least needed slots, doubling so growing stays O(1) on average"""
+        self.size = max(needed, 2 * self.size)
+        self.tickets.extend([0] * (self.size - len(self.tickets)))
+        # Rebuild the partial sums in O(n)
+        self.tree = [0] + self.tickets[:]
+        for i in range(1, self.size + 1):
+            parent = i + (i & -i)
+            if parent <= self.size:
+                self.tree[parent] += self.tree[i]
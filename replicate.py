@@ -0,0 +1,266 @@
+"""
+Monte Carlo replication runner for CPU Scheduling Algorithms
+One trace is one sample - this runs the algorithms on many random workloads
+drawn from the same distribution and reports every metric with error bars
+
+Replication k uses generators.generate_workload with seed + k, so a run can
+always be repeated. Replications run on all CPU cores, but their metrics are
+added up in replication order, so the answer doesn't depend on the worker count
+
+Nothing is kept per replication: each metric has a running mean and variance
+(Welford's method) and a few quantile sketches (the P-squared algorithm),
+all of fixed size. Once every algorithm's confidence interval of the chosen
+metric is narrower than --ci-width, the remaining replications are skipped
+
+Usage:
+    python replicate.py --algorithms 1,2,4-2 --replications 10000 --ci-width 0.5
+"""
+
+import argparse
+import math
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import parser
+from generators import KINDS, generate_workload
+from main import execute_algorithm
+from metrics import compute_metrics
+from output import algorithm_label
+
+# Metrics of each replication that are summarized
+REPLICATION_METRICS = ("mean_turnaround", "p99_turnaround", "mean_waiting", "mean_response",
+                       "fairness", "cpu_utilization")
+
+# Quantiles of each metric (over the replications) that are tracked
+SKETCH_QUANTILES = (0.05, 0.5, 0.95)
+
+# z value of a 95% confidence interval (normal approximation)
+Z_95 = 1.96
+
+# Never stop before this many replications - the variance estimate is too shaky before that
+MIN_REPLICATIONS = 10
+
+
+class RunningStats:
+    """Count, mean and variance of a stream of numbers, without storing them (Welford's method)"""
+
+    __slots__ = ("count", "mean", "_squares")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._squares = 0.0  # Sum of squared differences from the mean
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._squares += delta * (value - self.mean)
+
+    @property
+    def variance(self):
+        """Sample variance (0 until there are two values)"""
+        return self._squares / (self.count - 1) if self.count > 1 else 0.0
+
+    def half_width(self, z=Z_95):
+        """Half the width of the confidence interval of the mean (infinite until there are two values)"""
+        if self.count < 2:
+            return math.inf
+        return z * math.sqrt(self.variance / self.count)
+
+
+class QuantileSketch:
+    """
+    Running estimate of one quantile in fixed memory - the P-squared algorithm
+    (Jain and Chlamtac): five markers whose heights follow the minimum, the
+    quantile, the maximum and the points halfway between them
+    """
+
+    __slots__ = ("quantile", "heights", "positions", "desired", "increments")
+
+    def __init__(self, quantile):
+        self.quantile = quantile
+        self.heights = []  # The first five values, then the marker heights
+        self.positions = [0, 1, 2, 3, 4]
+        self.desired = [0, 2 * quantile, 4 * quantile, 2 + 2 * quantile, 4]
+        self.increments = [0, quantile / 2, quantile, (1 + quantile) / 2, 1]
+
+    def add(self, value):
+        heights = self.heights
+        if len(heights) < 5:
+            heights.append(value)
+            heights.sort()
+            return
+        positions = self.positions
+
+        # Find the cell the value falls in, stretching the ends if needed
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+        for marker in range(cell + 1, 5):
+            positions[marker] += 1
+        for marker in range(5):
+            self.desired[marker] += self.increments[marker]
+
+        # Move the middle markers that are off by a whole position or more
+        for marker in (1, 2, 3):
+            off = self.desired[marker] - positions[marker]
+            if ((off >= 1 and positions[marker + 1] - positions[marker] > 1) or
+                    (off <= -1 and positions[marker - 1] - positions[marker] < -1)):
+                step = 1 if off > 0 else -1
+                height = self._parabolic(marker, step)
+                if not heights[marker - 1] < height < heights[marker + 1]:
+                    height = self._linear(marker, step)
+                heights[marker] = height
+                positions[marker] += step
+
+    def _parabolic(self, marker, step):
+        """New marker height from the parabola through it and its neighbours"""
+        q, n = self.heights, self.positions
+        return q[marker] + step / (n[marker + 1] - n[marker - 1]) * (
+            (n[marker] - n[marker - 1] + step) * (q[marker + 1] - q[marker]) / (n[marker + 1] - n[marker]) +
+            (n[marker + 1] - n[marker] - step) * (q[marker] - q[marker - 1]) / (n[marker] - n[marker - 1]))
+
+    def _linear(self, marker, step):
+        """New marker height on the line to the neighbour it moves towards"""
+        q, n = self.heights, self.positions
+        return q[marker] + step * (q[marker + step] - q[marker]) / (n[marker + step] - n[marker])
+
+    def value(self):
+        """The current estimate (exact while there are five values or fewer)"""
+        heights = self.heights
+        if not heights:
+            return 0.0
+        if len(heights) < 5:
+            return heights[min(len(heights) - 1, int(self.quantile * len(heights)))]
+        return heights[2]
+
+
+class MetricSummary:
+    """Running mean, variance and quantiles of one metric over the replications"""
+
+    __slots__ = ("stats", "sketches")
+
+    def __init__(self):
+        self.stats = RunningStats()
+        self.sketches = [QuantileSketch(quantile) for quantile in SKETCH_QUANTILES]
+
+    def add(self, value):
+        self.stats.add(value)
+        for sketch in self.sketches:
+            sketch.add(value)
+
+
+def run_replication(task):
+    """
+    Run every algorithm on one random workload, in a worker process
+    Returns [(label, {metric: value})] - only the summary numbers travel back
+    """
+    seed, algorithms, count, kind, mean_service, load = task
+    workload = generate_workload(count, kind, seed, mean_service, load)
+    rows = []
+    for algorithm_id, quantum in algorithms:
+        result = execute_algorithm(workload, algorithm_id, quantum, "replicate", seed=seed)
+        metrics = compute_metrics(workload, result)
+        rows.append((algorithm_label(algorithm_id, quantum),
+                     {name: metrics[name] for name in REPLICATION_METRICS}))
+    return rows
+
+
+def precise_enough(summaries, metric, ci_width):
+    """Is the confidence interval of metric narrower than ci_width for every algorithm?"""
+    return all(summary[metric].stats.count >= MIN_REPLICATIONS and
+               2 * summary[metric].stats.half_width() <= ci_width
+               for summary in summaries.values())
+
+
+def replicate(algorithms, replications, seed=0, count=1000, kind="poisson", mean_service=5, load=0.9,
+              ci_width=None, metric="mean_turnaround", max_workers=None):
+    """
+    Run up to replications random workloads and summarize the metrics of every algorithm
+    Returns ({label: {metric: MetricSummary}}, replications actually used)
+    """
+    if metric not in REPLICATION_METRICS:
+        raise ValueError(f"Unknown metric: {metric}")
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    summaries = {}
+    finished = {}  # Replications that came back before the ones in front of them
+    used = 0  # Replications added to the summaries so far (always the first ones)
+    submitted = 0
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        running = {}
+        while used < replications:
+            # Keep a few replications per worker in flight - not all of them, so we can stop early
+            while submitted < replications and len(running) + len(finished) < 2 * max_workers:
+                task = (seed + submitted, algorithms, count, kind, mean_service, load)
+                running[executor.submit(run_replication, task)] = submitted
+                submitted += 1
+
+            done, not_done = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                finished[running.pop(future)] = future.result()
+
+            # Add up the results in replication order
+            while used in finished:
+                for label, values in finished.pop(used):
+                    summary = summaries.setdefault(label, {name: MetricSummary() for name in REPLICATION_METRICS})
+                    for name, value in values.items():
+                        summary[name].add(value)
+                used += 1
+                if ci_width is not None and precise_enough(summaries, metric, ci_width):
+                    for future in running:
+                        future.cancel()
+                    return summaries, used
+
+    return summaries, used
+
+
+def print_replication_table(summaries, used, out=sys.stdout):
+    """Print mean, 95% confidence interval and quantiles of every metric of every algorithm"""
+    lines = [f"Replications: {used}\n",
+             f"{'Algorithm':<20} {'Metric':<16} {'Mean':>10} {'+/-95%':>9}"
+             + "".join(f" {'p' + format(quantile * 100, 'g'):>9}" for quantile in SKETCH_QUANTILES) + "\n"]
+    for label, summary in summaries.items():
+        for name in REPLICATION_METRICS:
+            stats = summary[name].stats
+            quantiles = "".join(f" {sketch.value():9.3f}" for sketch in summary[name].sketches)
+            lines.append(f"{label:<20} {name:<16} {stats.mean:10.3f} {stats.half_width():9.3f}{quantiles}\n")
+    out.write("".join(lines))
+
+
+def main(argv=None):
+    """Command line entry point for the replication runner"""
+    arguments = argparse.ArgumentParser(description="Run scheduling algorithms on many random workloads")
+    arguments.add_argument("--algorithms", default="1,2,3,4-2,5,6,7", help="algorithms like the input's second line")
+    arguments.add_argument("--replications", type=int, default=1000, help="most workloads to run")
+    arguments.add_argument("--seed", type=int, default=0, help="seed of the first workload (then +1, +2, ...)")
+    arguments.add_argument("--count", type=int, default=1000, help="processes per workload")
+    arguments.add_argument("--kind", choices=KINDS, default="poisson", help="workload distribution")
+    arguments.add_argument("--mean-service", type=float, default=5, help="average service time")
+    arguments.add_argument("--load", type=float, default=0.9, help="how busy the CPU is on average")
+    arguments.add_argument("--ci-width", type=float, default=None,
+                           help="stop once every 95%% confidence interval of --metric is narrower than this")
+    arguments.add_argument("--metric", choices=REPLICATION_METRICS, default="mean_turnaround",
+                           help="metric --ci-width applies to")
+    arguments.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    options = arguments.parse_args(argv)
+
+    summaries, used = replicate(parser.parse_algorithms(options.algorithms), options.replications,
+                                options.seed, options.count, options.kind, options.mean_service, options.load,
+                                options.ci_width, options.metric, options.workers)
+    print_replication_table(summaries, used)
+
+
+# This is where the program starts when you run it
+if __name__ == "__main__":
+    main()
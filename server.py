@@ -0,0 +1,202 @@
+"""
+Scheduling server for CPU Scheduling Algorithms
+Keeps the simulator running in the background, so a caller doesn't pay for
+starting Python and importing everything on every simulation
+
+Clients talk JSON lines over a local TCP or Unix socket. Each request is one line:
+    {"id": 1, "input": "<same text main.py reads>", "cores": 1,
+     "smp_policy": "global", "migration_cost": 0, "seed": 0, "context_switch": 0}
+and for every algorithm in the input one line comes back, in input order,
+as soon as it is ready, followed by a line saying the request is done:
+    {"id": 1, "algorithm": "FCFS", "output": "<what main.py would print>"}
+    {"id": 1, "done": true}
+A request that can't be run gets {"id": 1, "error": "..."} instead
+
+Simulations run on a pool of worker processes. Only so many may be waiting
+at once - when they are all taken we stop reading new requests, so a fast
+client is slowed down by its own socket instead of filling up our memory
+
+Usage:
+    python server.py --port 8765 --workers 4
+    python server.py --socket /tmp/scheduler.sock
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+
+import parser
+from main import execute_algorithm, print_result, print_trace_label
+from metrics import compute_metrics
+from output import algorithm_label
+
+# How many simulations may wait for a worker (on top of the ones running)
+QUEUE_SIZE = 64
+
+# Each worker keeps the last input it parsed - all algorithms of one request share it
+_last_input = None
+
+
+def load_input(input_text):
+    """Parse an input text, or reuse it if this worker just parsed the same text"""
+    global _last_input
+    if _last_input is None or _last_input[0] != input_text:
+        _last_input = (input_text, parser.parse(io.StringIO(input_text)))
+    return _last_input[1]
+
+
+def run_job(input_text, algorithm_id, quantum, cores, smp_policy, migration_cost, seed, context_switch):
+    """Run one algorithm of a request in a worker and return what main.py would print for it"""
+    operation, algorithms, workload = load_input(input_text)
+    result = execute_algorithm(workload, algorithm_id, quantum, "server",
+                               cores, smp_policy, migration_cost, seed, context_switch)
+    out = io.StringIO()
+    if operation == "trace":
+        print_trace_label(algorithm_id, quantum, out)
+    if operation == "compare":
+        # Results come back one algorithm at a time, so each one sends its own metrics table
+        operation = "metrics"
+    metrics = compute_metrics(workload, result) if operation == "metrics" else None
+    print_result(workload, result, operation, metrics, out)
+    return out.getvalue()
+
+
+class SchedulingServer:
+    """Accepts requests from any number of connections and runs them on one worker pool"""
+
+    def __init__(self, workers=None, queue_size=QUEUE_SIZE):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.jobs = set()  # Jobs handed to the pool that have not finished yet
+        # One slot per simulation that is running or waiting for a worker
+        self.slots = asyncio.Semaphore(self.workers + queue_size)
+
+    async def submit(self, *job):
+        """Hand one job to the pool, waiting first if all slots are taken"""
+        await self.slots.acquire()
+        job_future = self.executor.submit(run_job, *job)
+        self.jobs.add(job_future)
+        job_future.add_done_callback(self.jobs.discard)
+        future = asyncio.wrap_future(job_future)
+        future.add_done_callback(lambda done: self.slots.release())
+        return future
+
+    async def handle_connection(self, reader, writer):
+        """Read requests from one client until it hangs up"""
+        write_lock = asyncio.Lock()
+        replies = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                # Submitting waits for free slots, so a busy server stops reading here
+                reply = await self.start_request(line, writer, write_lock)
+                replies.add(reply)
+                reply.add_done_callback(replies.discard)
+            if replies:
+                await asyncio.gather(*replies)
+        except asyncio.CancelledError:
+            pass  # The server is shutting down
+        finally:
+            writer.close()
+
+    async def start_request(self, line, writer, write_lock):
+        """Submit every algorithm of one request and return the task that sends the answers"""
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            input_text = request["input"]
+            # The first two lines say what to print and which algorithms to run
+            header = input_text.split("\n", 2)
+            algorithms = parser.parse_algorithms(header[1].strip())
+            labels = [algorithm_label(algorithm_id, quantum) for algorithm_id, quantum in algorithms]
+            options = (request.get("cores", 1), request.get("smp_policy", "global"),
+                       request.get("migration_cost", 0), request.get("seed", 0),
+                       request.get("context_switch", 0))
+        except (ValueError, KeyError, IndexError, AttributeError, TypeError) as error:
+            return asyncio.ensure_future(self.send(writer, write_lock, {"id": request_id, "error": str(error)}))
+
+        futures = []
+        for label, (algorithm_id, quantum) in zip(labels, algorithms):
+            futures.append((label, await self.submit(input_text, algorithm_id, quantum, *options)))
+        return asyncio.ensure_future(self.send_results(writer, write_lock, request_id, futures))
+
+    async def send_results(self, writer, write_lock, request_id, futures):
+        """Send each result back as soon as it (and the ones before it) are done"""
+        try:
+            for label, future in futures:
+                output = await future
+                await self.send(writer, write_lock, {"id": request_id, "algorithm": label, "output": output})
+            await self.send(writer, write_lock, {"id": request_id, "done": True})
+        except Exception as error:
+            for label, future in futures:
+                future.cancel()
+            await self.send(writer, write_lock, {"id": request_id, "error": str(error)})
+
+    async def send(self, writer, write_lock, message):
+        """Write one JSON line, waiting if the client reads slower than we write"""
+        async with write_lock:
+            try:
+                writer.write((json.dumps(message) + "\n").encode("utf-8"))
+                await writer.drain()
+            except ConnectionError:
+                pass  # The client went away - nobody to tell
+
+    def close(self):
+        """Stop the worker processes, dropping the jobs that have not started yet"""
+        # (shutdown(cancel_futures=True) does this too, but only from Python 3.9 on)
+        for job_future in list(self.jobs):
+            job_future.cancel()
+        self.executor.shutdown()
+
+
+async def serve(host="127.0.0.1", port=8765, socket_path=None, workers=None, queue_size=QUEUE_SIZE):
+    """Run the server until it is stopped"""
+    scheduling_server = SchedulingServer(workers, queue_size)
+    try:
+        if socket_path:
+            listener = await asyncio.start_unix_server(scheduling_server.handle_connection, socket_path)
+        else:
+            listener = await asyncio.start_server(scheduling_server.handle_connection, host, port)
+        # Stop on SIGTERM as well as Ctrl+C, so the worker processes are shut down too
+        stopped = asyncio.get_running_loop().create_future()
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopped.set_result, None)
+        except NotImplementedError:
+            pass  # Windows has no SIGTERM handlers in asyncio
+
+        address = listener.sockets[0].getsockname()
+        print(f"Listening on {address}", flush=True)
+        async with listener:
+            await stopped
+    finally:
+        scheduling_server.close()
+
+
+def main(argv=None):
+    """Command line entry point for the scheduling server"""
+    arguments = argparse.ArgumentParser(description="Serve the scheduling algorithms over a local socket")
+    arguments.add_argument("--host", default="127.0.0.1")
+    arguments.add_argument("--port", type=int, default=8765, help="TCP port (0 picks a free one)")
+    arguments.add_argument("--socket", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    arguments.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    arguments.add_argument("--queue-size", type=int, default=QUEUE_SIZE,
+                           help="simulations that may wait for a worker before we stop reading requests")
+    options = arguments.parse_args(argv)
+    try:
+        asyncio.run(serve(options.host, options.port, options.socket, options.workers, options.queue_size))
+    except KeyboardInterrupt:
+        pass
+
+
+# This is where the program starts when you run it
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""
+Multi-CPU (SMP) simulation for CPU Scheduling Algorithms
+Runs the algorithms on several cores at once - run_smp for the non-preemptive
+ones, run_smp_preemptive for Round Robin, SRTF and Preemptive Priority
+
+Two ways to share the work:
+- "global": one ready queue, any free core takes the best process
+- "steal":  every core has its own queue, an idle core steals from the
+            busiest queue and pays a migration cost for it
+"""
+
+import heapq
+from collections import deque
+
+from algorithms import arrival_key, service_key, priority_key, multi_level_key
+import instrument
+from engine import ArrivalStream, alone_run_time
+from models import ScheduleResult
+from ready_queue import HeapReadyQueue
+
+# Algorithms that can run on several cores, with the key that orders them
+SMP_KEYS = {
+    "1": arrival_key,  # FCFS
+    "2": service_key,  # SJN
+    "3": priority_key,  # Priority
+    "5": multi_level_key,  # Multi-Level
+}
+
+# Preemptive algorithms that can run on several cores, with key_of(process, remaining_time)
+# like engine.run_preemptive (Round Robin, "4", needs no key)
+SMP_PREEMPTIVE_KEYS = {
+    "6": lambda process, remaining_time: remaining_time,  # SRTF
+    "7": lambda process, remaining_time: process.priority,  # Preemptive Priority
+}
+
+POLICIES = ("global", "steal")
+
+
+def run_smp(workload, sort_key, cores, policy="global", migration_cost=0):
+    """
+    Run processes to completion on several cores
+    sort_key(process) decides who goes first - smallest key wins
+    Returns a ScheduleResult just like a single-CPU run, with core_stats filled in
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown SMP policy: {policy}")
+    if cores < 1:
+        raise ValueError("Need at least one core")
+
+    result = ScheduleResult(workload)
+    processes = workload.processes
+    arrivals = ArrivalStream(workload, result)
+
+    # One queue for everybody, or one queue per core
+    queue_count = 1 if policy == "global" else cores
+    ready_queues = [HeapReadyQueue() for _ in range(queue_count)]
+    waiting = 0  # Processes sitting in any ready queue
+
+    free_cores = list(range(cores))  # Kept sorted so the lowest free core goes first
+    busy_cores = []  # Heap of (time the core becomes free, core)
+    busy_time = [0] * cores
+    migrations = 0
+    counters = instrument.counters  # None unless instrumentation is switched on
+    current_time = 0
+
+    while current_time < workload.last_instant:
+        # Cores whose process has finished are free again
+        while busy_cores and busy_cores[0][0] <= current_time:
+            heapq.heappush(free_cores, heapq.heappop(busy_cores)[1])
+
+        # New arrivals go to the global queue, or to an idle core (so it starts
+        # there without a migration), or else to the core with the shortest queue
+        for process in arrivals.pop_arrived(current_time):
+            if policy == "global":
+                target = 0
+            else:
+                idle_cores = [core for core in free_cores if not ready_queues[core]]
+                if idle_cores:
+                    target = min(idle_cores)
+                else:
+                    target = min(range(queue_count), key=lambda core: len(ready_queues[core]))
+            ready_queues[target].push(process.index, sort_key(process))
+            waiting += 1
+            if counters is not None:
+                counters["ready_queue_push"] += 1
+
+        # Give every free core something to do
+        while free_cores and waiting:
+            core = heapq.heappop(free_cores)
+            own_queue = 0 if policy == "global" else core
+            delay = 0
+            if not ready_queues[own_queue]:
+                # Nothing of our own - steal the best process from the busiest other queue
+                own_queue = max(range(queue_count), key=lambda other: len(ready_queues[other]))
+                delay = migration_cost
+                migrations += 1
+            process = processes[ready_queues[own_queue].pop()]
+            waiting -= 1
+            if counters is not None:
+                counters["ready_queue_pop"] += 1
+                counters["decisions"] += 1
+                counters["context_switches"] += 1
+
+            # Waiting until now (and while it moves over), then executing
+            start_time = current_time + delay
+            finish_time = start_time + process.service_time
+            result.add_interval(process.index, process.arrival_time, start_time, '.')
+            result.add_interval(process.index, start_time, finish_time, '*')
+            result.finish(process, finish_time)
+            busy_time[core] += finish_time - start_time  # Moving it over is not work
+            heapq.heappush(busy_cores, (finish_time, core))
+
+        # Jump to the next event - an arrival or a core becoming free
+        next_events = []
+        if arrivals.has_more():
+            next_events.append(arrivals.next_arrival_time())
+        if busy_cores and waiting:
+            next_events.append(busy_cores[0][0])
+        if not next_events:
+            break
+        current_time = min(next_events)
+
+    if counters is not None:
+        counters["migrations"] += migrations
+    result.core_stats = core_stats(result, busy_time, migrations)
+    return result
+
+
+class CoreRun:
+    """What one core is doing in run_smp_preemptive"""
+
+    __slots__ = ("process_index", "picked", "start", "end", "busy_time")
+
+    def __init__(self):
+        self.process_index = None  # None while the core is idle
+        self.picked = 0  # When the core took its process - it waits for the migration until start
+        self.start = 0  # When the process starts running
+        self.end = 0  # When the run is over - the process finishes or its quantum ends
+        self.busy_time = 0
+
+    def take(self, process_index, picked, start, end):
+        """Give the core a process that runs from start to end"""
+        self.process_index = process_index
+        self.picked = picked
+        self.start = start
+        self.end = end
+
+    def stop(self, time, result, remaining):
+        """Take the process off the core at time, record what it did and give back its index"""
+        process_index = self.process_index
+        result.add_interval(process_index, self.picked, min(self.start, time), '.')
+        ran = max(0, time - self.start)
+        result.add_interval(process_index, self.start, self.start + ran, '*')
+        remaining[process_index] -= ran
+        self.busy_time += ran  # Moving it over is not work
+        self.process_index = None
+        return process_index
+
+
+def run_smp_preemptive(workload, key_of, cores, policy="global", migration_cost=0, quantum=-1):
+    """
+    Run processes on several cores, taking the CPU away from them when needed
+    key_of(process, remaining_time) decides who goes first - smallest key wins, and
+    a newcomer with a smaller key takes the core of the running process with the
+    biggest one (SRTF, Preemptive Priority). With key_of None the cores take turns
+    like Round Robin instead: a process whose quantum is over goes to the back of
+    its queue, unless nobody is waiting there - then it keeps its core
+    Returns a ScheduleResult just like a single-CPU run, with core_stats filled in
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown SMP policy: {policy}")
+    if cores < 1:
+        raise ValueError("Need at least one core")
+    round_robin = key_of is None
+    if round_robin and quantum <= 0:
+        raise ValueError("Round Robin needs a positive quantum")
+
+    result = ScheduleResult(workload, quantum=quantum if round_robin else -1)
+    processes = workload.processes
+    last_instant = workload.last_instant
+    arrivals = ArrivalStream(workload, result)
+
+    # One queue for everybody, or one queue per core - Round Robin queues are
+    # first come first served, the others are heaps ordered by (key, arrival order)
+    queue_count = 1 if policy == "global" else cores
+    ready_queues = [deque() if round_robin else HeapReadyQueue() for _ in range(queue_count)]
+    keys = {}  # (key, arrival order) of every process in a heap
+    remaining = {}  # Time each unfinished process still needs (when its current run started)
+    ready_since = {}  # When each waiting process started waiting
+    arrived = 0  # Processes that have arrived so far
+
+    runs = [CoreRun() for _ in range(cores)]
+    migrations = 0
+    counters = instrument.counters  # None unless instrumentation is switched on
+    current_time = 0
+
+    while True:
+        # Runs that are over: the process finished, its quantum ended or the simulation did
+        expired = []
+        for core, run in enumerate(runs):
+            if run.process_index is not None and run.end <= current_time:
+                end = run.end
+                process_index = run.stop(end, result, remaining)
+                if remaining[process_index] == 0:
+                    result.finish(processes[process_index], end)
+                else:
+                    expired.append((core, process_index))
+        if current_time >= last_instant:
+            break
+
+        # New arrivals go to the global queue, or to an idle core, or else to the core with the shortest queue
+        for process in arrivals.pop_arrived(current_time):
+            if policy == "global":
+                target = 0
+            else:
+                idle_cores = [core for core, run in enumerate(runs)
+                              if run.process_index is None and not ready_queues[core]]
+                if idle_cores:
+                    target = idle_cores[0]
+                else:
+                    target = min(range(queue_count), key=lambda core: len(ready_queues[core]))
+            remaining[process.index] = process.service_time
+            ready_since[process.index] = process.arrival_time
+            if round_robin:
+                ready_queues[target].append(process.index)
+            else:
+                keys[process.index] = (key_of(process, process.service_time), arrived)
+                ready_queues[target].push(process.index, keys[process.index])
+            arrived += 1
+            if counters is not None:
+                counters["ready_queue_push"] += 1
+
+        # Round Robin: processes whose quantum is over go in line after the newcomers
+        for core, process_index in expired:
+            queue = ready_queues[0 if policy == "global" else core]
+            if queue:
+                queue.append(process_index)
+                ready_since[process_index] = current_time
+                if counters is not None:
+                    counters["ready_queue_push"] += 1
+            else:
+                # Nobody else wants this core - carry on, many quanta at a time
+                run_time = alone_run_time(arrivals, current_time, remaining[process_index], quantum, last_instant)
+                runs[core].take(process_index, current_time, current_time, current_time + run_time)
+
+        # Give every free core something to do, lowest core first
+        for core, run in enumerate(runs):
+            if run.process_index is not None:
+                continue
+            own_queue = 0 if policy == "global" else core
+            delay = 0
+            if not ready_queues[own_queue]:
+                if policy == "global":
+                    break  # Nothing is waiting at all
+                # Nothing of our own - steal the best process from the busiest other queue
+                own_queue = max(range(queue_count), key=lambda other: len(ready_queues[other]))
+                if not ready_queues[own_queue]:
+                    break
+                delay = migration_cost
+                migrations += 1
+            queue = ready_queues[own_queue]
+            process_index = queue.popleft() if round_robin else queue.pop()
+            start = min(current_time + delay, last_instant)
+            if not round_robin:
+                run_time = remaining[process_index]
+            elif queue:
+                run_time = min(quantum, remaining[process_index])
+            else:
+                run_time = alone_run_time(arrivals, start, remaining[process_index], quantum, last_instant)
+            result.add_interval(process_index, ready_since[process_index], current_time, '.')
+            run.take(process_index, current_time, start, min(start + run_time, last_instant))
+            if counters is not None:
+                counters["ready_queue_pop"] += 1
+                counters["decisions"] += 1
+                counters["context_switches"] += 1
+
+        # SRTF and Preemptive Priority: while a waiting process has a smaller key than
+        # a running one, it takes the core of the worst of them, which goes back in line
+        # (with one queue any core may be taken, with a queue per core only its own)
+        if not round_robin:
+            for own_queue, queue in enumerate(ready_queues):
+                candidates = runs if policy == "global" else [runs[own_queue]]
+                while queue:
+                    worst, worst_key = None, None
+                    for run in candidates:
+                        if run.process_index is None:
+                            continue
+                        left = remaining[run.process_index] - max(0, current_time - run.start)
+                        key = (key_of(processes[run.process_index], left), keys[run.process_index][1])
+                        if worst is None or key > worst_key:
+                            worst, worst_key = run, key
+                    best = queue.peek()
+                    if worst is None or keys[best] >= worst_key:
+                        break
+                    preempted = worst.stop(current_time, result, remaining)
+                    queue.pop()
+                    keys[preempted] = worst_key
+                    ready_since[preempted] = current_time
+                    queue.push(preempted, worst_key)
+                    result.add_interval(best, ready_since[best], current_time, '.')
+                    worst.take(best, current_time, current_time, min(current_time + remaining[best], last_instant))
+                    if counters is not None:
+                        counters["ready_queue_pop"] += 1
+                        counters["ready_queue_push"] += 1
+                        counters["decisions"] += 1
+                        counters["context_switches"] += 1
+
+        # Jump to the next event - an arrival or a run that ends
+        next_events = [run.end for run in runs if run.process_index is not None]
+        if arrivals.has_more():
+            next_events.append(arrivals.next_arrival_time())
+        if not next_events:
+            break
+        current_time = min(next_events)
+
+    if counters is not None:
+        counters["migrations"] += migrations
+    result.core_stats = core_stats(result, [run.busy_time for run in runs], migrations)
+    return result
+
+
+def core_stats(result, busy_time, migrations):
+    """Per-core utilization and load imbalance, as a dictionary"""
+    makespan = max(result.finish_time, default=0)
+    mean_busy = sum(busy_time) / len(busy_time)
+    return {
+        "busy_time": busy_time,
+        "utilization": [busy / makespan if makespan else 0.0 for busy in busy_time],
+        # 0 means every core did the same amount of work
+        "imbalance": max(busy_time) / mean_busy - 1 if mean_busy else 0.0,
+        "migrations": migrations,
+    }
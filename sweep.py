@@ -0,0 +1,125 @@
+"""
+Sweep runner for CPU Scheduling Algorithms
+Runs every (workload, algorithm, quantum) combination of a grid on all
+CPU cores at once and merges the answers into one table
+
+Usage:
+    python sweep.py trace1.txt trace2.txt --algorithms 1,2,3,4,5 --quanta 1-64
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import binary_format
+import parser
+from main import execute_algorithm
+from output import QUANTUM_ALGORITHMS, algorithm_label
+
+# Each worker process keeps the workloads it has already read,
+# so a trace file is parsed once per worker instead of once per run
+_workloads = {}
+
+
+def parse_quanta(quanta_chunk):
+    """Turn '1-4,8' into [1, 2, 3, 4, 8]"""
+    quanta = []
+    for part in quanta_chunk.split(','):
+        if '-' in part:
+            low, high = part.split('-')
+            quanta.extend(range(int(low), int(high) + 1))
+        else:
+            quanta.append(int(part))
+    return quanta
+
+
+def build_grid(algorithm_ids, quanta):
+    """
+    List every (algorithm_id, quantum) pair to run
+    Only the time-slice algorithms (RR, MLFQ, lottery, stride) use a quantum,
+    the others run once with -1
+    """
+    grid = []
+    for algorithm_id in algorithm_ids:
+        if int(algorithm_id) in QUANTUM_ALGORITHMS:
+            grid.extend((algorithm_id, quantum) for quantum in quanta)
+        else:
+            grid.append((algorithm_id, -1))
+    return grid
+
+
+def load_workload(path):
+    """
+    Read a workload file, or reuse it if this worker already read it
+    Binary files (see binary_format.py) are memory-mapped instead of parsed
+    """
+    if path not in _workloads:
+        if binary_format.is_binary(path):
+            _workloads[path] = binary_format.load_workload(path)
+        else:
+            operation, algorithms, workload = parser.parse_file(path)
+            _workloads[path] = workload
+    return _workloads[path]
+
+
+def run_one(task):
+    """Run one grid cell and return one row of the table"""
+    path, algorithm_id, quantum = task
+    workload = load_workload(path)
+    result = execute_algorithm(workload, algorithm_id, quantum, "sweep")
+
+    # Only keep the summary numbers - sending whole results back is slow
+    count = workload.process_count
+    return (
+        path,
+        algorithm_label(algorithm_id, quantum),
+        sum(result.turn_around_time) / count,
+        sum(result.norm_turn) / count,
+        max(result.finish_time),
+    )
+
+
+def run_sweep(workload_paths, grid, max_workers=None):
+    """
+    Run every workload with every grid entry, spread across worker processes
+    Rows come back in the same order as the tasks, whatever order they finish in
+    """
+    tasks = [(path, algorithm_id, quantum)
+             for path in workload_paths
+             for algorithm_id, quantum in grid]
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    # Hand out the tasks in chunks so each worker gets several runs per message
+    chunksize = max(1, len(tasks) // (max_workers * 4))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(run_one, tasks, chunksize=chunksize))
+
+
+def print_sweep_table(rows, out=sys.stdout):
+    """Print all rows as one table"""
+    out.write(f"{'Workload':<30} {'Algorithm':<12} {'Turnaround':>11} {'NormTurn':>9} {'Makespan':>9}\n")
+    out.write("-" * 75 + "\n")
+    for path, label, mean_turnaround, mean_norm_turn, makespan in rows:
+        out.write(f"{path:<30} {label:<12} {mean_turnaround:11.2f} {mean_norm_turn:9.2f} {makespan:9d}\n")
+
+
+def main(argv=None):
+    """Command line entry point for the sweep runner"""
+    arguments = argparse.ArgumentParser(description="Run a grid of scheduling simulations in parallel")
+    arguments.add_argument("workloads", nargs="+",
+                           help="input files in the same format as main.py reads, or binary workload files")
+    arguments.add_argument("--algorithms", default="1,2,3,4,5", help="algorithm ids, e.g. 1,2,4")
+    arguments.add_argument("--quanta", default="1-64", help="quanta for RR, MLFQ, lottery and stride, e.g. 1-64 or 1,2,4,8")
+    arguments.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    options = arguments.parse_args(argv)
+
+    grid = build_grid(options.algorithms.split(','), parse_quanta(options.quanta))
+    rows = run_sweep(options.workloads, grid, options.workers)
+    print_sweep_table(rows)
+
+
+# This is where the program starts when you run it
+if __name__ == "__main__":
+    main()
@@ -29,12 +29,46 @@ E,8,2,2
     
     print("Output:")
     print(result.stdout)
-    return result.returncode == 0
+    return (result.returncode == 0 and
+            "C     | | | | |.|.|.|.|.|*|*|*|*| | | | | | | |" in result.stdout and
+            "E     | | | | | | | | |.|.|.|.|.|.|.|.|.|.|*|*|" in result.stdout)
+
+def test_intervals():
+    """Test that run intervals merge, skip empty runs and draw the timeline row"""
+    print("\nTesting run intervals...")
+    from models import Process, Workload, ScheduleResult
+    from output import format_timeline_row
+
+    process = Process(0, "A", 1, 4)
+    result = ScheduleResult(Workload([process], 8))
+    result.add_interval(0, 1, 3, '.')
+    result.add_interval(0, 3, 3, '*')  # Empty - left out
+    result.add_interval(0, 3, 5, '*')
+    result.add_interval(0, 5, 7, '*')  # Continues the last run - merged into it
+    result.add_interval(0, 7, 10, '.')  # Goes past the end of the timeline - cut when drawn
+    row = format_timeline_row(process, result.intervals[0], 8)
+
+    print(result.intervals[0])
+    print(row, end="")
+    return (result.intervals[0] == [(1, 3, '.'), (3, 7, '*'), (7, 10, '.')] and
+            row == "A     | |.|.|*|*|*|*|.|\n")
+
+def test_fcfs_arrival_order():
+    """Test that FCFS goes by arrival time even when the input is not in arrival order"""
+    print("\nTesting FCFS with unsorted input...")
+    from models import Process, Workload
+    from algorithms import first_come_first_serve, burst_scheduling
+
+    # C arrives before A, so it runs before A even though A comes first in the input
+    workload = Workload([Process(0, "A", 5, 2), Process(1, "B", 0, 10), Process(2, "C", 1, 2)], 30)
+    finish = first_come_first_serve(workload).finish_time
+    print("Finish:", finish)
+    return finish == [14, 10, 12] and burst_scheduling(workload, "1").finish_time == finish
 
 def test_sjn():
     """Test Shortest Job Next algorithm"""
     print("\nTesting SJN algorithm...")
-    input_data = """trace
+    input_data = """stats
 2
 20
 5
@@ -52,12 +86,13 @@ E,8,2,2
     
     print("Output:")
     print(result.stdout)
-    return result.returncode == 0
+    # At 9, E (2) goes before C (4) and D (5)
+    return result.returncode == 0 and "Finish     |  3  |  9  | 15  | 20  | 11  |" in result.stdout
 
 def test_priority():
     """Test Priority Scheduling algorithm"""
     print("\nTesting Priority Scheduling algorithm...")
-    input_data = """trace
+    input_data = """stats
 3
 20
 5
@@ -75,12 +110,13 @@ E,8,2,2
     
     print("Output:")
     print(result.stdout)
-    return result.returncode == 0
+    # At 9, C (priority 1) goes first, then E (2), then D (3)
+    return result.returncode == 0 and "Finish     |  3  |  9  | 13  | 20  | 15  |" in result.stdout
 
 def test_round_robin():
     """Test Round Robin algorithm"""
     print("\nTesting Round Robin algorithm...")
-    input_data = """trace
+    input_data = """stats
 4-2
 20
 5
@@ -98,12 +134,105 @@ E,8,2,2
     
     print("Output:")
     print(result.stdout)
-    return result.returncode == 0
+    # Newcomers go in line before the process whose quantum just expired
+    return result.returncode == 0 and "Finish     |  5  | 17  | 13  | 20  | 15  |" in result.stdout
+
+def step_round_robin(workload, quantum):
+    """Round Robin one quantum at a time, with no shortcuts - the reference for test_round_robin_alone"""
+    from collections import deque
+    from models import ScheduleResult
+    result = ScheduleResult(workload)
+    upcoming = deque(sorted(workload.processes, key=lambda process: (process.arrival_time, process.index)))
+    remaining = [process.service_time for process in workload.processes]
+    ready = deque()  # (process_index, waiting_since)
+    time = 0
+    while time < workload.last_instant:
+        while upcoming and upcoming[0].arrival_time <= time:
+            process = upcoming.popleft()
+            ready.append((process.index, process.arrival_time))
+        if not ready:
+            if not upcoming:
+                break
+            time = upcoming[0].arrival_time
+            continue
+        process_index, waiting_since = ready.popleft()
+        result.add_interval(process_index, waiting_since, time, '.')
+        run_time = min(quantum, remaining[process_index], workload.last_instant - time)
+        result.add_interval(process_index, time, time + run_time, '*')
+        time += run_time
+        remaining[process_index] -= run_time
+        while upcoming and upcoming[0].arrival_time <= time:
+            process = upcoming.popleft()
+            ready.append((process.index, process.arrival_time))
+        if remaining[process_index]:
+            ready.append((process_index, time))
+        else:
+            result.finish(workload.processes[process_index], time)
+    return result
+
+def test_round_robin_alone():
+    """Test that a process alone on the CPU runs many quanta in one go, exactly like quantum by quantum"""
+    print("\nTesting Round Robin alone on the CPU...")
+    from models import Process, Workload
+    from algorithms import round_robin
+
+    # A runs alone until B arrives at 5, in the middle of A's second quantum
+    workloads = [
+        Workload([Process(0, "A", 0, 20), Process(1, "B", 5, 3)], 40),
+        Workload([Process(0, "A", 0, 20), Process(1, "B", 5, 3)], 17),  # Cut short while A is alone
+        Workload([Process(0, "A", 0, 9), Process(1, "B", 3, 30), Process(2, "C", 26, 2)], 60),
+    ]
+    result = round_robin(workloads[0], 4)
+    print("Finish:", result.finish_time, "A:", result.intervals[0])
+    same = all(round_robin(workload, quantum).intervals == step_round_robin(workload, quantum).intervals and
+               round_robin(workload, quantum).finish_time == step_round_robin(workload, quantum).finish_time
+               for workload in workloads for quantum in (1, 3, 4))
+    return (same and result.finish_time == [23, 11] and
+            result.intervals == [[(0, 8, '*'), (8, 11, '.'), (11, 23, '*')], [(5, 8, '.'), (8, 11, '*')]])
+
+def test_burst_round_robin_alone():
+    """Test that Round Robin with I/O bursts still runs a lone process many quanta at a time"""
+    print("\nTesting Round Robin with I/O bursts alone on the CPU...")
+    from models import Process, Workload
+    from algorithms import burst_scheduling
+
+    # A computes for 50, does I/O for 10, then computes for 50 more - quantum 1
+    alone = burst_scheduling(Workload([Process(0, "A", 0, 100, 1, (50, 10, 50))], 200), "4", 1)
+    # Same with a switch cost, and with B arriving at 70 in the middle of A's second burst
+    shared = burst_scheduling(Workload([Process(0, "A", 0, 100, 1, (50, 10, 50)), Process(1, "B", 70, 2)], 200),
+                              "4", 1, 1)
+    print("Alone:", alone.intervals[0])
+    print("Shared:", shared.finish_time, shared.intervals)
+    return (alone.intervals == [[(0, 50, '*'), (50, 60, 'B'), (60, 110, '*')]] and alone.finish_time == [110] and
+            shared.finish_time == [117, 76] and
+            shared.intervals[0][:4] == [(0, 1, '.'), (1, 51, '*'), (51, 61, 'B'), (61, 70, '*')] and
+            shared.intervals[0][-1] == (77, 117, '*'))
+
+def test_round_robin_quantum():
+    """Test that Round Robin without a positive quantum is an error, not an endless loop"""
+    print("\nTesting Round Robin without a quantum...")
+    outputs = []
+    for algorithm in ("4", "4-0"):
+        input_data = f"""stats
+{algorithm}
+20
+2
+A,0,3,1
+B,2,6,2
+"""
+        result = subprocess.run([sys.executable, "main.py"],
+                              input=input_data,
+                              capture_output=True,
+                              text=True,
+                              timeout=30)
+        print(result.stdout)
+        outputs.append(result.stdout)
+    return all("Error: Round Robin needs a positive quantum" in output for output in outputs)
 
 def test_multi_level():
     """Test Multi-level Queue algorithm"""
     print("\nTesting Multi-level Queue algorithm...")
-    input_data = """trace
+    input_data = """stats
 5
 20
 5
@@ -121,7 +250,136 @@ E,8,2,2
     
     print("Output:")
     print(result.stdout)
-    return result.returncode == 0
+    # C is in the high queue, E in the medium one and D in the low one
+    return result.returncode == 0 and "Finish     |  3  |  9  | 13  | 20  | 15  |" in result.stdout
+
+def test_ready_queues():
+    """Test the heap ready queues: smallest key first, ties in arrival order"""
+    print("\nTesting ready queues...")
+    from ready_queue import HeapReadyQueue, MultiLevelReadyQueue
+
+    heap = HeapReadyQueue()
+    for process_index, key in ((0, 5), (1, 2), (2, 5), (3, 1), (4, 2)):
+        heap.push(process_index, key)
+    heap_order = [heap.pop() for _ in range(len(heap))]
+
+    # Processes 0 and 3 are in level 0, 1 and 4 in level 1, 2 in level 2
+    levels = {0: 0, 1: 1, 2: 2, 3: 0, 4: 1}
+    multi_level = MultiLevelReadyQueue(3, levels.get)
+    for process_index, key in ((2, 1), (1, 3), (0, 9), (4, 3), (3, 4)):
+        multi_level.push(process_index, key)
+    saved = multi_level.snapshot()
+    multi_level_order = [multi_level.pop() for _ in range(len(multi_level))]
+    multi_level.restore(saved)
+
+    print("Heap order:", heap_order, "Multi-level order:", multi_level_order)
+    return (heap_order == [3, 1, 4, 0, 2] and multi_level_order == [3, 0, 1, 4, 2]
+            and len(multi_level) == 5 and multi_level.pop() == 3)
+
+def test_mlfq():
+    """Test the Multi-level Feedback Queue algorithm"""
+    print("\nTesting MLFQ algorithm...")
+    input_data = """stats
+8-1
+20
+5
+A,0,3,1
+B,2,6,2
+C,4,4,1
+D,6,5,3
+E,8,2,2
+"""
+
+    result = subprocess.run([sys.executable, "main.py"],
+                          input=input_data,
+                          capture_output=True,
+                          text=True)
+
+    print("Output:")
+    print(result.stdout)
+    return result.returncode == 0 and "Finish     |  4  | 17  | 18  | 20  | 14  |" in result.stdout
+
+def test_io_bursts():
+    """Test processes with I/O bursts and a context switch cost"""
+    print("\nTesting I/O bursts...")
+    input_data = """trace
+1
+25
+3
+A,0,3,1,4,2
+B,1,5,2
+C,2,2,1,3,2,1,1
+"""
+
+    result = subprocess.run([sys.executable, "main.py", "--context-switch", "1"],
+                          input=input_data,
+                          capture_output=True,
+                          text=True)
+
+    print("Output:")
+    print(result.stdout)
+    # Streamed input ('-' instead of the count) must not drop the I/O bursts
+    streamed = subprocess.run([sys.executable, "main.py"],
+                              input=input_data.replace("trace", "stats").replace("\n3\n", "\n-\n"),
+                              capture_output=True,
+                              text=True)
+    print(streamed.stdout)
+    # Every switch costs 1, and C (ready since 2) goes before A (back from I/O at 8)
+    return (result.returncode == 0 and
+            "A     |.|*|*|*|B|B|B|B|.|.|.|.|.|.|*|*| |" in result.stdout and
+            "C     | | |.|.|.|.|.|.|.|.|.|*|*|B|B|B|.|*|*|B|*| |" in result.stdout and
+            "Finish     | 12  |  8  | 17  |-----|" in streamed.stdout and
+            "Blocked    |  4  |  0  |  4  | 2.67|" in streamed.stdout)
+
+def test_proportional_share():
+    """Test that lottery and stride scheduling share the CPU by tickets"""
+    print("\nTesting lottery and stride scheduling...")
+    from models import Process, Workload
+    from algorithms import lottery_scheduling, stride_scheduling
+
+    # Three long jobs with 100, 50 and 25 tickets should get about 4:2:1 of the CPU
+    workload = Workload([
+        Process(0, "A", 0, 10000, 1),
+        Process(1, "B", 0, 10000, 2),
+        Process(2, "C", 0, 10000, 4),
+    ], 7000)
+    same_seed = lottery_scheduling(workload, 1, 7).intervals == lottery_scheduling(workload, 1, 7).intervals
+    shares = []
+    for result in (lottery_scheduling(workload, 1, 7), stride_scheduling(workload, 1)):
+        shares.append([sum(end - start for start, end, state in history if state == '*')
+                       for history in result.intervals])
+
+    print("Lottery CPU time:", shares[0])
+    print("Stride CPU time: ", shares[1])
+    return (same_seed and shares[1] == [4000, 2000, 1000]
+            and all(abs(time - expected) < 200 for time, expected in zip(shares[0], (4000, 2000, 1000))))
+
+def test_preemptive():
+    """Test SRTF and Preemptive Priority algorithms"""
+    print("\nTesting preemptive algorithms...")
+    input_data = """stats
+6,7
+20
+5
+A,0,3,1
+B,2,6,2
+C,4,4,1
+D,6,5,3
+E,8,2,2
+"""
+    
+    result = subprocess.run([sys.executable, "main.py"], 
+                          input=input_data, 
+                          capture_output=True, 
+                          text=True)
+    
+    print("Output:")
+    print(result.stdout)
+    # Each algorithm's table comes after its name
+    srtf, _, priority = result.stdout.partition("Preemptive-Priority")
+    return (result.returncode == 0 and "SRTF" in srtf and
+            "Finish     |  3  | 15  |  8  | 20  | 10  |" in srtf and
+            "Finish     |  3  | 13  |  8  | 20  | 15  |" in priority)
 
 def test_stats_mode():
     """Test statistics mode"""
@@ -146,6 +404,498 @@ E,8,2,2
     print(result.stdout)
     return result.returncode == 0
 
+def test_smp_mode():
+    """Test running on several cores with work stealing"""
+    print("\nTesting multi-core mode...")
+    input_data = """stats
+2
+20
+5
+A,0,3,1
+B,2,6,2
+C,4,4,1
+D,6,5,3
+E,8,2,2
+"""
+    
+    result = subprocess.run([sys.executable, "main.py", "--cores", "2", "--smp-policy", "steal"], 
+                          input=input_data, 
+                          capture_output=True, 
+                          text=True)
+    
+    print("Output:")
+    print(result.stdout)
+
+    outputs = []
+    for processes in ("A,0,10,1\nB,1,1,1\n", "A,0,10,1\nB,0,2,1\nC,0,5,1\nD,0,5,1\n"):
+        input_data = f"stats\n1\n30\n{processes.count(chr(10))}\n{processes}"
+        outputs.append(subprocess.run([sys.executable, "main.py", "--cores", "2", "--smp-policy", "steal",
+                                       "--migration-cost", "2"],
+                                      input=input_data,
+                                      capture_output=True,
+                                      text=True).stdout)
+        print(outputs[-1])
+
+    return (result.returncode == 0 and
+            "Finish     |  3  |  8  |  8  | 13  | 10  |" in result.stdout and
+            "Migrations | 0" in result.stdout and
+            # B arrives while core 1 is idle, so it starts there at once - no migration
+            "Finish     | 10  |  2  |-----|" in outputs[0] and "Migrations | 0" in outputs[0] and
+            "Core 1     | busy      1 |" in outputs[0] and
+            # C waits on core 0's queue, so core 1 steals it at 7 and moves it over until 9
+            "Finish     | 10  |  2  | 14  |  7  |-----|" in outputs[1] and "Migrations | 1" in outputs[1] and
+            "Core 1     | busy     12 |" in outputs[1])
+
+def test_smp_preemptive():
+    """Test Round Robin, SRTF and Preemptive Priority on several cores"""
+    print("\nTesting preemptive multi-core mode...")
+    input_data = """stats
+4-2,6,7
+20
+5
+A,0,3,1
+B,2,6,2
+C,4,4,1
+D,6,5,3
+E,8,2,2
+"""
+
+    result = subprocess.run([sys.executable, "main.py", "--cores", "2"],
+                          input=input_data,
+                          capture_output=True,
+                          text=True)
+
+    print("Output:")
+    print(result.stdout)
+
+    # Both cores busy when C arrives: it takes the core of the worst running process
+    # (SRTF: A and B both have 9 left, so B, which arrived later; Priority: A)
+    input_data = """stats
+6,7
+30
+3
+A,0,10,3
+B,0,10,2
+C,1,2,1
+"""
+    preempted = subprocess.run([sys.executable, "main.py", "--cores", "2"],
+                               input=input_data,
+                               capture_output=True,
+                               text=True)
+    print(preempted.stdout)
+    srtf, _, priority = preempted.stdout.partition("Preemptive-Priority")
+
+    rr, _, rest = result.stdout.partition("SRTF")
+    return (result.returncode == 0 and preempted.returncode == 0 and
+            "Finish     |  3  | 10  |  8  | 13  | 10  |" in rr and
+            rest.count("Finish     |  3  |  8  |  8  | 13  | 10  |") == 2 and
+            "Finish     | 10  | 12  |  3  |-----|" in srtf and
+            "Finish     | 12  | 10  |  3  |-----|" in priority)
+
+def test_instrumentation():
+    """Test phase timers and counters"""
+    print("\nTesting instrumentation...")
+    input_data = """stats
+4-2
+20
+5
+A,0,3,1
+B,2,6,2
+C,4,4,1
+D,6,5,3
+E,8,2,2
+"""
+    
+    result = subprocess.run([sys.executable, "main.py", "--instrument"], 
+                          input=input_data, 
+                          capture_output=True, 
+                          text=True)
+    
+    print("Report:")
+    print(result.stderr)
+    return result.returncode == 0 and "schedule" in result.stderr and "context_switches" in result.stderr
+
+def test_independent_results():
+    """Test that two simulations in one interpreter don't share state"""
+    print("\nTesting independent results...")
+    from models import Process, Workload
+    from algorithms import first_come_first_serve, shortest_job_next
+
+    workload = Workload([
+        Process(0, "A", 0, 3, 1),
+        Process(1, "B", 1, 6, 2),
+        Process(2, "C", 2, 1, 1),
+    ], 20)
+    fcfs = first_come_first_serve(workload)
+    sjn = shortest_job_next(workload)
+
+    print("FCFS finish:", fcfs.finish_time)
+    print("SJN finish: ", sjn.finish_time)
+    return fcfs.finish_time == [3, 9, 10] and sjn.finish_time == [3, 10, 4]
+
+def test_sweep():
+    """Test the parallel sweep runner"""
+    print("\nTesting sweep runner...")
+    import tempfile
+    input_data = """stats
+1
+20
+5
+A,0,3,1
+B,2,6,2
+C,4,4,1
+D,6,5,3
+E,8,2,2
+"""
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as workload_file:
+        workload_file.write(input_data)
+    try:
+        result = subprocess.run([sys.executable, "sweep.py", workload_file.name,
+                                 "--quanta", "1-3", "--workers", "2"],
+                              capture_output=True,
+                              text=True)
+    finally:
+        os.remove(workload_file.name)
+
+    print("Output:")
+    print(result.stdout)
+    return result.returncode == 0 and "RR-3" in result.stdout
+
+def test_streaming_input():
+    """Test reading processes without a process count up front"""
+    print("\nTesting streaming input...")
+    input_data = """stats
+2
+20
+-
+A,0,3,1
+B,2,6,2
+C,4,4,1
+D,6,5,3
+E,8,2,2
+"""
+    
+    result = subprocess.run([sys.executable, "main.py"], 
+                          input=input_data, 
+                          capture_output=True, 
+                          text=True)
+    
+    print("Output:")
+    print(result.stdout)
+    return result.returncode == 0 and "|  E  |" in result.stdout
+
+def test_metrics_mode():
+    """Test summary metrics mode"""
+    print("\nTesting metrics mode...")
+    input_data = """metrics
+1
+20
+5
+A,0,3,1
+B,2,6,2
+C,4,4,1
+D,6,5,3
+E,8,2,2
+"""
+    
+    result = subprocess.run([sys.executable, "main.py"], 
+                          input=input_data, 
+                          capture_output=True, 
+                          text=True)
+    
+    print("Output:")
+    print(result.stdout)
+    return result.returncode == 0 and "Waiting    |     4.60 |" in result.stdout
+
+def test_compare_mode():
+    """Test the ranked comparison of several algorithms"""
+    print("\nTesting compare mode...")
+    input_data = """compare
+1,2,4-1
+20
+5
+A,0,3,1
+B,2,6,2
+C,4,4,1
+D,6,5,3
+E,8,2,2
+"""
+
+    result = subprocess.run([sys.executable, "main.py"],
+                          input=input_data,
+                          capture_output=True,
+                          text=True)
+
+    print("Output:")
+    print(result.stdout)
+    lines = result.stdout.splitlines()
+    # One table, best mean turnaround first
+    return (result.returncode == 0 and len(lines) == 4 and
+            lines[1].startswith("1    |SJN") and lines[2].startswith("2    |FCFS") and
+            lines[3].startswith("3    |RR-1"))
+
+def test_export():
+    """Test the CSV and JSON Lines exporters"""
+    print("\nTesting export...")
+    import csv
+    import json
+    import tempfile
+    input_data = """stats
+1,4-2
+20
+3
+A,0,3,1
+B,2,6,2
+C,4,4,1
+"""
+
+    with tempfile.TemporaryDirectory() as folder:
+        processes_path = os.path.join(folder, "processes.csv")
+        intervals_path = os.path.join(folder, "intervals.jsonl")
+        result = subprocess.run([sys.executable, "main.py", "--export-processes", processes_path,
+                                 "--export-intervals", intervals_path],
+                              input=input_data,
+                              capture_output=True,
+                              text=True)
+        with open(processes_path, newline="") as processes_file:
+            rows = list(csv.DictReader(processes_file))
+        with open(intervals_path) as intervals_file:
+            intervals = [json.loads(line) for line in intervals_file]
+
+    print(rows[:3])
+    # Same numbers as the FCFS stats table: B finishes at 9 after waiting 1
+    return (result.returncode == 0 and len(rows) == 6 and
+            rows[1] == {"algorithm": "FCFS", "process": "B", "arrival": "2", "service": "6", "priority": "2",
+                        "finish": "9", "turnaround": "7", "norm_turn": "1.1666666666666667",
+                        "waiting": "1", "response": "1", "blocked": "0"} and
+            {"algorithm": "RR-2", "process": "A", "start": 2, "end": 4, "state": "waiting"} in intervals)
+
+def test_kernels():
+    """Test that the array kernels give exactly the reference results"""
+    print("\nTesting array kernels...")
+    import random
+    from models import Process, Workload
+    from algorithms import first_come_first_serve, shortest_job_next, priority_scheduling
+    from kernels import run_kernel
+
+    reference = {"1": first_come_first_serve, "2": shortest_job_next, "3": priority_scheduling}
+    rng = random.Random(5)
+    for sorted_arrivals in (True, False):
+        arrivals = sorted(rng.randint(0, 300) for _ in range(200))
+        if not sorted_arrivals:
+            rng.shuffle(arrivals)
+        # last_instant cuts the run short, so some processes never start
+        workload = Workload([Process(i, f"P{i}", arrivals[i], rng.randint(1, 6), rng.randint(1, 4))
+                             for i in range(200)], 500)
+        for algorithm_id, algorithm in reference.items():
+            expected = algorithm(workload)
+            result = run_kernel(workload, algorithm_id)
+            if (result.finish_time != expected.finish_time or result.norm_turn != expected.norm_turn or
+                    result.intervals != expected.intervals):
+                print(f"Algorithm {algorithm_id} differs (sorted arrivals: {sorted_arrivals})")
+                return False
+    return True
+
+def test_replicate():
+    """Test the replication runner's running statistics and early stopping"""
+    print("\nTesting replication runner...")
+    import random
+    import statistics
+    from replicate import RunningStats, QuantileSketch, replicate, MIN_REPLICATIONS
+
+    rng = random.Random(3)
+    values = [rng.expovariate(1) for _ in range(5000)]
+    stats = RunningStats()
+    median = QuantileSketch(0.5)
+    for value in values:
+        stats.add(value)
+        median.add(value)
+    exact_median = statistics.median(values)
+    print(f"mean {stats.mean:.4f}, median sketch {median.value():.4f} (exact {exact_median:.4f})")
+
+    # A very wide target is met as soon as we are allowed to stop
+    summaries, used = replicate([("1", -1), ("4", 2)], 100, count=50, ci_width=1000, max_workers=2)
+    print(f"stopped after {used} replications")
+    return (abs(stats.mean - statistics.mean(values)) < 1e-9 and
+            abs(stats.variance - statistics.variance(values)) < 1e-9 and
+            abs(median.value() - exact_median) < 0.05 and
+            used == MIN_REPLICATIONS and set(summaries) == {"FCFS", "RR-2"} and
+            summaries["FCFS"]["mean_turnaround"].stats.count == MIN_REPLICATIONS)
+
+def test_benchmark():
+    """Test the benchmark suite on a tiny seeded workload"""
+    print("\nTesting benchmark suite...")
+    import json
+    result = subprocess.run([sys.executable, "benchmark.py", "--sizes", "50",
+                             "--kinds", "heavy,bursty", "--no-memory"],
+                          capture_output=True,
+                          text=True)
+
+    print("Output:")
+    print(result.stdout)
+    rows = [json.loads(line) for line in result.stdout.splitlines()]
+    return result.returncode == 0 and len(rows) == 20 and all(row["seconds"] >= 0 for row in rows)
+
+def test_binary_format():
+    """Test saving and memory-mapping binary workload and result files"""
+    print("\nTesting binary format...")
+    import tempfile
+    from models import Process, Workload
+    from algorithms import round_robin
+    import binary_format
+
+    workload = Workload([
+        Process(0, "A", 0, 3, 1),
+        Process(1, "B", 2, 6, 2),
+        Process(2, "C", 4, 4, 1),
+    ], 20)
+    with tempfile.TemporaryDirectory() as folder:
+        workload_path = os.path.join(folder, "workload.bin")
+        result_path = os.path.join(folder, "result.bin")
+        binary_format.save_workload(workload, workload_path)
+        mapped = binary_format.load_workload(workload_path)
+        result = round_robin(mapped, 2)
+        binary_format.save_result(result, result_path, mapped.last_instant)
+        loaded = binary_format.load_result(result_path, mapped)
+        same = (loaded.finish_time == round_robin(workload, 2).finish_time
+                and loaded.intervals == result.intervals)
+        # A Process record is built once and then reused
+        same = same and mapped.processes[1] is mapped.processes[1]
+
+        # Input not in arrival order is sorted from the arrival column
+        unsorted = Workload([Process(0, "A", 4, 4, 1), Process(1, "B", 0, 3, 1), Process(2, "C", 2, 6, 2)], 20)
+        binary_format.save_workload(unsorted, workload_path)
+        unsorted_mapped = binary_format.load_workload(workload_path)
+        same = same and round_robin(unsorted_mapped, 2).intervals == round_robin(unsorted, 2).intervals
+        del mapped, loaded, result, unsorted_mapped  # Let go of the mapped files before the folder is removed
+
+    print("Round trip identical:", same)
+    return same
+
+def test_result_cache():
+    """Test that a second run with the same input comes from the cache"""
+    print("\nTesting result cache...")
+    import tempfile
+    input_data = """stats
+1,4-2
+20
+5
+A,0,3,1
+B,2,6,2
+C,4,4,1
+D,6,5,3
+E,8,2,2
+"""
+    with tempfile.TemporaryDirectory() as folder:
+        runs = [subprocess.run([sys.executable, "main.py", "--cache", folder, "--instrument"],
+                               input=input_data,
+                               capture_output=True,
+                               text=True)
+                for _ in range(2)]
+        stored = len(os.listdir(folder))
+
+    print("Output:")
+    print(runs[1].stdout)
+    # The cached run gives the same output without making any scheduling decisions
+    return (runs[0].stdout == runs[1].stdout and stored == 2
+            and "decisions" in runs[0].stderr and "decisions" not in runs[1].stderr)
+
+def test_incremental():
+    """Test that edits re-simulated from a checkpoint match a full run"""
+    print("\nTesting incremental re-simulation...")
+    from models import Process, Workload
+    from incremental import IncrementalSimulation, run_algorithm
+
+    processes = [Process(i, f"P{i}", 2 * i, 1 + (7 * i) % 5, 1 + i % 3) for i in range(40)]
+    workload = Workload(processes, 200)
+    same = True
+    for algorithm_id in "1234567":
+        simulation = IncrementalSimulation(workload, algorithm_id, 2, every=4)
+        result = simulation.edit(30, service_time=9)
+        result = simulation.edit(25, priority=3, arrival_time=70)
+        edited = list(processes)
+        edited[30] = Process(30, "P30", 60, 9, processes[30].priority)
+        edited[25] = Process(25, "P25", 70, processes[25].service_time, 3)
+        full = run_algorithm(Workload(edited, 200), algorithm_id, 2)
+        same = same and result.intervals == full.intervals and result.finish_time == full.finish_time
+
+    print("Identical to a full run:", same)
+    return same
+
+def test_server():
+    """Test that the scheduling server answers like main.py"""
+    print("\nTesting scheduling server...")
+    import json
+    import socket
+    input_data = """stats
+1,4-2,6
+20
+5
+A,0,3,1
+B,2,6,2
+C,4,4,1
+D,6,5,3
+E,8,2,2
+"""
+    expected = subprocess.run([sys.executable, "main.py"],
+                              input=input_data,
+                              capture_output=True,
+                              text=True).stdout
+
+    server = subprocess.Popen([sys.executable, "server.py", "--port", "0", "--workers", "2"],
+                              stdout=subprocess.PIPE,
+                              text=True)
+    try:
+        # The server prints its address, like "Listening on ('127.0.0.1', 40000)"
+        address = server.stdout.readline().split("on ", 1)[1].strip("()\n").split(", ")
+        with socket.create_connection((address[0].strip("'"), int(address[1]))) as connection:
+            stream = connection.makefile("rw")
+            stream.write(json.dumps({"id": 1, "input": input_data}) + "\n")
+            stream.flush()
+            replies = []
+            while not replies or "done" not in replies[-1]:
+                replies.append(json.loads(stream.readline()))
+    finally:
+        server.terminate()
+        server.wait()
+
+    output = "".join(reply["output"] for reply in replies[:-1])
+    print("Output:")
+    print(output)
+    return output == expected and [reply.get("algorithm") for reply in replies] == ["FCFS", "RR-2", "SRTF", None]
+
+def test_online():
+    """Test that the online scheduler makes the same decisions as the batch algorithms"""
+    print("\nTesting online scheduler...")
+    from models import Process, Workload
+    from algorithms import round_robin, shortest_remaining_time_first
+    from online import OnlineScheduler
+
+    processes = [
+        Process(0, "A", 0, 3, 1),
+        Process(1, "B", 2, 6, 2),
+        Process(2, "C", 4, 4, 1),
+        Process(3, "D", 6, 5, 3),
+        Process(4, "E", 8, 2, 2),
+    ]
+    workload = Workload(processes, 100)
+    same = True
+    for algorithm_id, batch in (("4", round_robin(workload, 2)), ("6", shortest_remaining_time_first(workload))):
+        scheduler = OnlineScheduler(algorithm_id, 2)
+        events = []
+        for process in processes:
+            events.extend(scheduler.advance(process.arrival_time))
+            scheduler.submit(process)
+        events.extend(scheduler.advance())
+        finish = [0] * len(processes)
+        for time, kind, process in events:
+            if kind == "complete":
+                finish[process.index] = time
+        print(f"Algorithm {algorithm_id} finish:", finish, scheduler.summary()["mean_turnaround"])
+        same = same and finish == batch.finish_time and scheduler.summary()["active"] == 0
+
+    return same
+
 def main():
     """Run all tests"""
     print("CPU Scheduling Algorithms - Python Implementation")
@@ -153,11 +903,38 @@ def main():
     
     tests = [
         ("FCFS Algorithm", test_fcfs),
+        ("Run Intervals", test_intervals),
+        ("FCFS Arrival Order", test_fcfs_arrival_order),
         ("SJN Algorithm", test_sjn),
         ("Priority Scheduling", test_priority),
         ("Round Robin", test_round_robin),
+        ("Round Robin Alone", test_round_robin_alone),
+        ("Round Robin Quantum", test_round_robin_quantum),
         ("Multi-level Queue", test_multi_level),
-        ("Statistics Mode", test_stats_mode)
+        ("Ready Queues", test_ready_queues),
+        ("MLFQ Algorithm", test_mlfq),
+        ("Lottery and Stride", test_proportional_share),
+        ("I/O Bursts", test_io_bursts),
+        ("Round Robin I/O Bursts Alone", test_burst_round_robin_alone),
+        ("Preemptive Algorithms", test_preemptive),
+        ("Statistics Mode", test_stats_mode),
+        ("Multi-core Mode", test_smp_mode),
+        ("Preemptive Multi-core Mode", test_smp_preemptive),
+        ("Instrumentation", test_instrumentation),
+        ("Independent Results", test_independent_results),
+        ("Sweep Runner", test_sweep),
+        ("Streaming Input", test_streaming_input),
+        ("Metrics Mode", test_metrics_mode),
+        ("Compare Mode", test_compare_mode),
+        ("Export", test_export),
+        ("Array Kernels", test_kernels),
+        ("Replication Runner", test_replicate),
+        ("Benchmark Suite", test_benchmark),
+        ("Binary Format", test_binary_format),
+        ("Result Cache", test_result_cache),
+        ("Incremental", test_incremental),
+        ("Server", test_server),
+        ("Online", test_online)
     ]
     
     passed = 0